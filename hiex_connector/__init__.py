@@ -1,4 +1,16 @@
-from .async_handlers import AsyncHiExNotifications, AsyncHiExExchangeUpdate, AsyncHiExUserKYCReviewed
+from .async_handlers import (
+    AsyncHiExNotifications,
+    AsyncHiExExchangeUpdate,
+    AsyncHiExUserKYCReviewed,
+    DedupStore,
+    MemoryDedupStore,
+    SQLiteDedupStore,
+    SQLiteJournal,
+)
 from .async_connector import AsyncHiExConnector
+from .async_watchers import ExchangeWatcher, ExchangePollScheduler
 from .sync_connector import HiExConnector
+from .codecs import JsonCodec, SimpleJsonCodec, OrjsonCodec
+from .policies import RateLimiter, INTERACTIVE, BATCH, use_lane, RetryPolicy, CircuitBreaker, HedgePolicy
+from .policies import HiExTimeout, deadline, use_timeout
 from .types import *
@@ -1,27 +1,90 @@
 from ..base import HiExConnectorBase
 from ..types import Empty, ResponseList
-from decimal import Decimal
+from ..codecs import to_decimal
+from collections import deque
+import asyncio
 
 
 class AsyncHiExConnector(HiExConnectorBase):
     """
     Асинхронна бібліотека для роботи з api.hiex.io
+
+    Конектор тримає власний пул з'єднань, тому його варто закривати:
+    через `async with AsyncHiExConnector(...) as hiex:` або викликом `await hiex.close()`
     """
-    async def currencies_list(self):
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self):
+        """
+        Закрити пул з'єднань та скасувати запити, що ще виконуються (наперед завантажувані сторінки,
+        оновлення кешу). Під час наступного запиту буде створено новий пул
+
+        :return: None
+        """
+        self._cancel_background_tasks()
+        await self._close_async_session()
+
+    async def _iter_pages(self, list_method, page_size, read_ahead, **kwargs):
+        """
+        Завантажувати сторінки списку по черзі, наперед запитуючи read_ahead наступних сторінок
+
+        :param list_method: Метод списку, який приймає limit та offset
+        :param page_size: Розмір сторінки
+        :param read_ahead: Скільки сторінок завантажувати наперед
+        :param kwargs: Інші аргументи list_method
+
+        :return: AsyncIterator[ResponseList]
+        """
+        tasks = deque()
+        offset = 0
+
+        def schedule():
+            nonlocal offset
+            tasks.append(self._add_background_task(
+                asyncio.ensure_future(list_method(limit=page_size, offset=offset, **kwargs)),
+            ))
+            offset += page_size
+
+        try:
+            for _ in range(read_ahead + 1):
+                schedule()
+            while tasks:
+                page = await tasks.popleft()
+                last = page.is_all or len(page) < page_size
+                if not last:
+                    schedule()
+                yield page
+                if last:
+                    break
+        finally:
+            for task in tasks:
+                if task.done():
+                    if not task.cancelled():
+                        task.exception()
+                else:
+                    task.cancel()
+
+    async def currencies_list(self, result_mode=None):
         """
         Отримати список валют
 
+        :param result_mode: 'model', 'dict' або 'record' (за замовчуванням – налаштування конектора)
+
         :return: ResponseList[Currency]
         """
-        resp = await self.get_async_request('currencies/list', {})
         from ..types.async_types import AsyncCurrency
-        currencies = ResponseList()
-        currencies.is_all = resp['is_all']
-        for currency in resp['currencies']:
-            currencies.append(AsyncCurrency(connector=self, **currency))
-        return currencies
 
-    async def pairs_list(self, currency1=Empty, currency2=Empty, search1=Empty, search2=Empty):
+        def build(resp):
+            self._remember_currencies(resp['currencies'])
+            return self._make_list(resp, 'currencies', AsyncCurrency, result_mode)
+
+        return await self.get_async_catalog('currencies/list', {}, build, result_mode)
+
+    async def pairs_list(self, currency1=Empty, currency2=Empty, search1=Empty, search2=Empty, result_mode=None):
         """
         Отримати список валютних пар
 
@@ -29,21 +92,23 @@ class AsyncHiExConnector(HiExConnectorBase):
         :param currency2: Валюта яку продаємо
         :param search1: Пошук валют які купуємо
         :param search2: Пошук валют які продаємо
+        :param result_mode: 'model', 'dict' або 'record' (за замовчуванням – налаштування конектора)
 
         :return: ResponseList[Pair]
         """
-        resp = await self.get_async_request('pairs/list', {
+        from ..types.async_types import AsyncPair
+
+        def build(resp):
+            pairs = self._make_list(resp, 'pairs', AsyncPair, result_mode)
+            self._remember_pairs(resp, pairs, AsyncPair)
+            return pairs
+
+        return await self.get_async_catalog('pairs/list', {
             'currency1': currency1,
             'currency2': currency2,
             'search1': search1,
             'search2': search2,
-        })
-        from ..types.async_types import AsyncPair
-        pairs = ResponseList()
-        pairs.is_all = resp['is_all']
-        for pair in resp['pairs']:
-            pairs.append(AsyncPair(connector=self, **pair))
-        return pairs
+        }, build, result_mode)
 
     async def pair_amount(self, currency1, currency2, amount1=Empty, amount2=Empty):
         """
@@ -56,13 +121,16 @@ class AsyncHiExConnector(HiExConnectorBase):
 
         :return: list[amount1, amount2, rate]
         """
+        quote = self._get_local_quote(currency1, currency2, amount1, amount2)
+        if quote is not None:
+            return quote
         resp = await self.get_async_request('pair/amount', {
             'currency1': currency1,
             'currency2': currency2,
             'amount1': amount1,
             'amount2': amount2,
-        })
-        return Decimal(resp['amount1']), Decimal(resp['amount2']), Decimal(resp['rate'])
+        }, coalesce=True)
+        return to_decimal(resp['amount1']), to_decimal(resp['amount2']), to_decimal(resp['rate'])
 
     async def exchange_create(
             self, currency1, currency2, address, tag=Empty, amount1=Empty, amount2=Empty, return_url=Empty,
@@ -102,7 +170,7 @@ class AsyncHiExConnector(HiExConnectorBase):
             'beneficiary_phone': beneficiary_phone,
             'validation': validation,
         })
-        return AsyncExchange(connector=self, **resp['exchange']) if resp['exchange'] else None
+        return self._make(AsyncExchange, resp['exchange']) if resp['exchange'] else None
 
     async def exchange_payment_get(self, exchange_id):
         """
@@ -115,8 +183,8 @@ class AsyncHiExConnector(HiExConnectorBase):
         from ..types.async_types import AsyncPayment
         resp = await self.get_async_request('exchange/payment/get', {
             'exchange_id': exchange_id,
-        })
-        return AsyncPayment(connector=self, **resp['payment'])
+        }, coalesce=True)
+        return self._make(AsyncPayment, resp['payment'])
 
     async def exchange_get(self, exchange_id, auth_key=None):
         """
@@ -128,13 +196,13 @@ class AsyncHiExConnector(HiExConnectorBase):
         """
         resp = await self.get_async_request('exchange/get', {
             'exchange_id': exchange_id,
-        })
+        }, coalesce=True)
         if auth_key is None:
             from ..types.async_types import AsyncExchange
-            return AsyncExchange(connector=self, **resp['exchange'])
+            return self._make(AsyncExchange, resp['exchange'])
         else:
             from ..types.async_types import AsyncExchangeWithAuthKey
-            return AsyncExchangeWithAuthKey(connector=self, auth_key=auth_key, **resp['exchange'])
+            return self._make(AsyncExchangeWithAuthKey, resp['exchange'], auth_key=auth_key)
 
     async def exchange_cancel(self, exchange_id):
         """
@@ -149,7 +217,7 @@ class AsyncHiExConnector(HiExConnectorBase):
         })
         return True
 
-    async def exchanges_list(self, limit=Empty, offset=Empty, status_list=Empty, short_exchange_id=Empty):
+    async def exchanges_list(self, limit=Empty, offset=Empty, status_list=Empty, short_exchange_id=Empty, result_mode=None):
         """
         Отримати список обмінів
 
@@ -157,6 +225,7 @@ class AsyncHiExConnector(HiExConnectorBase):
         :param offset: Починати з рядку
         :param status_list: Список статусів
         :param short_exchange_id: Перші символи з exchange_id
+        :param result_mode: 'model', 'dict' або 'record' (за замовчуванням – налаштування конектора)
 
 
         :return: ResponseList[Exchange]
@@ -167,14 +236,59 @@ class AsyncHiExConnector(HiExConnectorBase):
             'offset': offset,
             'status_list': status_list,
             'short_exchange_id': short_exchange_id,
-        })
-        exchanges = ResponseList()
-        exchanges.is_all = resp['is_all']
-        for exchange in resp['exchanges']:
-            exchanges.append(AsyncExchange(connector=self, **exchange))
-        return exchanges
+        }, coalesce=True)
+        return self._make_list(resp, 'exchanges', AsyncExchange, result_mode)
+
+    async def iter_exchanges(self, status_list=Empty, short_exchange_id=Empty, page_size=100, read_ahead=1, result_mode=None):
+        """
+        Перебрати всі обміни посторінково.
+        Поки обробляється поточна сторінка, наступні вже завантажуються
+
+        :param status_list: Список статусів
+        :param short_exchange_id: Перші символи з exchange_id
+        :param page_size: Скільки записів завантажувати за один запит
+        :param read_ahead: Скільки наступних сторінок завантажувати наперед
+        :param result_mode: 'model', 'dict' або 'record' (за замовчуванням – налаштування конектора)
+
+        :return: AsyncIterator[Exchange]
+        """
+        async for page in self._iter_pages(
+                self.exchanges_list,
+                page_size,
+                read_ahead,
+                status_list=status_list,
+                short_exchange_id=short_exchange_id,
+                result_mode=result_mode,
+        ):
+            for item in page:
+                yield item
+
+    async def stream_exchanges(self, limit=Empty, offset=Empty, status_list=Empty, short_exchange_id=Empty, result_mode=None):
+        """
+        Отримати список обмінів як потік.
+        Елементи розбираються з відповіді по одному, тому пам'ять не залежить від limit
+
+        :param limit: Скільки обмінів завантажувати
+        :param offset: Починати з рядку
+        :param status_list: Список статусів
+        :param short_exchange_id: Перші символи з exchange_id
+        :param result_mode: 'model', 'dict' або 'record' (за замовчуванням – налаштування конектора)
 
-    async def application_exchanges_list(self, limit=Empty, offset=Empty, user_id=Empty, status_list=Empty, short_exchange_id=Empty):
+        :return: AsyncIterator[Exchange]
+        """
+        from ..types.async_types import AsyncExchange
+        build = self._item_builder(AsyncExchange, result_mode)
+        async for item in self.stream_async_request('exchanges/list', {
+            'limit': limit,
+            'offset': offset,
+            'status_list': status_list,
+            'short_exchange_id': short_exchange_id,
+        }, 'exchanges'):
+            yield build(item)
+
+    async def application_exchanges_list(
+            self, limit=Empty, offset=Empty, user_id=Empty, status_list=Empty, short_exchange_id=Empty, result_mode=None,
+    ):
         """
         Отримати список обмінів
 
@@ -183,6 +297,7 @@ class AsyncHiExConnector(HiExConnectorBase):
         :param user_id: ID користувача
         :param status_list: Список статусів
         :param short_exchange_id: Перші символи з exchange_id
+        :param result_mode: 'model', 'dict' або 'record' (за замовчуванням – налаштування конектора)
 
 
         :return: ResponseList[Exchange]
@@ -194,19 +309,104 @@ class AsyncHiExConnector(HiExConnectorBase):
             'user_id': user_id,
             'status_list': status_list,
             'short_exchange_id': short_exchange_id,
-        })
+        }, coalesce=True)
+        return self._make_list(resp, 'exchanges', AsyncExchange, result_mode)
+
+    async def iter_application_exchanges(self, user_id=Empty, status_list=Empty, short_exchange_id=Empty, page_size=100, read_ahead=1, result_mode=None):
+        """
+        Перебрати всі обміни додатку посторінково.
+        Поки обробляється поточна сторінка, наступні вже завантажуються
+
+        :param user_id: ID користувача
+        :param status_list: Список статусів
+        :param short_exchange_id: Перші символи з exchange_id
+        :param page_size: Скільки записів завантажувати за один запит
+        :param read_ahead: Скільки наступних сторінок завантажувати наперед
+        :param result_mode: 'model', 'dict' або 'record' (за замовчуванням – налаштування конектора)
+
+        :return: AsyncIterator[Exchange]
+        """
+        async for page in self._iter_pages(
+                self.application_exchanges_list,
+                page_size,
+                read_ahead,
+                user_id=user_id,
+                status_list=status_list,
+                short_exchange_id=short_exchange_id,
+                result_mode=result_mode,
+        ):
+            for item in page:
+                yield item
+
+    async def stream_application_exchanges(
+            self, limit=Empty, offset=Empty, user_id=Empty, status_list=Empty, short_exchange_id=Empty, result_mode=None,
+    ):
+        """
+        Отримати список обмінів додатку як потік.
+        Елементи розбираються з відповіді по одному, тому пам'ять не залежить від limit
+
+        :param limit: Скільки обмінів завантажувати
+        :param offset: Починати з рядку
+        :param user_id: ID користувача
+        :param status_list: Список статусів
+        :param short_exchange_id: Перші символи з exchange_id
+        :param result_mode: 'model', 'dict' або 'record' (за замовчуванням – налаштування конектора)
+
+        :return: AsyncIterator[Exchange]
+        """
+        from ..types.async_types import AsyncExchange
+        build = self._item_builder(AsyncExchange, result_mode)
+        async for item in self.stream_async_request('application/exchanges/list', {
+            'limit': limit,
+            'offset': offset,
+            'user_id': user_id,
+            'status_list': status_list,
+            'short_exchange_id': short_exchange_id,
+        }, 'exchanges'):
+            yield build(item)
+
+    async def application_exchanges_export(
+            self, user_id=Empty, status_list=Empty, short_exchange_id=Empty, page_size=100, concurrency=8, result_mode=None,
+    ):
+        """
+        Вивантажити всі обміни додатку.
+        Сторінки завантажуються паралельно (не більше concurrency запитів одночасно) та збираються по порядку.
+        Обміни, які повторюються через зсув рядків між сторінками, пропускаються
+
+        :param user_id: ID користувача
+        :param status_list: Список статусів
+        :param short_exchange_id: Перші символи з exchange_id
+        :param page_size: Скільки обмінів завантажувати за один запит
+        :param concurrency: Скільки сторінок завантажувати одночасно
+        :param result_mode: 'model', 'dict' або 'record' (за замовчуванням – налаштування конектора)
+
+        :return: ResponseList[Exchange]
+        """
         exchanges = ResponseList()
-        exchanges.is_all = resp['is_all']
-        for exchange in resp['exchanges']:
-            exchanges.append(AsyncExchange(connector=self, **exchange))
+        seen = set()
+        async for page in self._iter_pages(
+                self.application_exchanges_list,
+                page_size,
+                max(concurrency - 1, 0),
+                user_id=user_id,
+                status_list=status_list,
+                short_exchange_id=short_exchange_id,
+                result_mode=result_mode,
+        ):
+            for exchange in page:
+                if exchange['exchange_id'] not in seen:
+                    seen.add(exchange['exchange_id'])
+                    exchanges.append(exchange)
+        exchanges.is_all = True
         return exchanges
 
-    async def application_users_list(self, limit=Empty, offset=Empty):
+    async def application_users_list(self, limit=Empty, offset=Empty, result_mode=None):
         """
         Отримати список користувачів
 
         :param limit: Скільки обмінів завантажувати
         :param offset: Починати з рядку
+        :param result_mode: 'model', 'dict' або 'record' (за замовчуванням – налаштування конектора)
 
 
         :return: ResponseList[User]
@@ -215,19 +415,50 @@ class AsyncHiExConnector(HiExConnectorBase):
         resp = await self.get_async_request('application/users/list', {
             'limit': limit,
             'offset': offset,
-        })
-        users = ResponseList()
-        users.is_all = resp['is_all']
-        for user in resp['users']:
-            users.append(AsyncUser(connector=self, **user))
-        return users
+        }, coalesce=True)
+        return self._make_list(resp, 'users', AsyncUser, result_mode)
+
+    async def iter_application_users(self, page_size=100, read_ahead=1, result_mode=None):
+        """
+        Перебрати всіх користувачів додатку посторінково.
+        Поки обробляється поточна сторінка, наступні вже завантажуються
+
+        :param page_size: Скільки записів завантажувати за один запит
+        :param read_ahead: Скільки наступних сторінок завантажувати наперед
+        :param result_mode: 'model', 'dict' або 'record' (за замовчуванням – налаштування конектора)
+
+        :return: AsyncIterator[User]
+        """
+        async for page in self._iter_pages(self.application_users_list, page_size, read_ahead, result_mode=result_mode):
+            for item in page:
+                yield item
+
+    async def stream_application_users(self, limit=Empty, offset=Empty, result_mode=None):
+        """
+        Отримати список користувачів як потік.
+        Елементи розбираються з відповіді по одному, тому пам'ять не залежить від limit
+
+        :param limit: Скільки користувачів завантажувати
+        :param offset: Починати з рядку
+        :param result_mode: 'model', 'dict' або 'record' (за замовчуванням – налаштування конектора)
+
+        :return: AsyncIterator[User]
+        """
+        from ..types.async_types import AsyncUser
+        build = self._item_builder(AsyncUser, result_mode)
+        async for item in self.stream_async_request('application/users/list', {
+            'limit': limit,
+            'offset': offset,
+        }, 'users'):
+            yield build(item)
 
-    async def application_stats_list(self, limit=Empty, offset=Empty):
+    async def application_stats_list(self, limit=Empty, offset=Empty, result_mode=None):
         """
         Завантажити статистику (за вибіркою)
 
         :param limit: Кількість днів
         :param offset: Скільки останніх днів пропустити
+        :param result_mode: 'model', 'dict' або 'record' (за замовчуванням – налаштування конектора)
 
         :return: ResponseList[Stat]
         """
@@ -235,12 +466,23 @@ class AsyncHiExConnector(HiExConnectorBase):
         resp = await self.get_async_request('application/stats/list', {
             'limit': limit,
             'offset': offset,
-        })
-        stats = ResponseList()
-        stats.is_all = resp['is_all']
-        for stat in resp['stats']:
-            stats.append(AsyncStat(connector=self, **stat))
-        return stats
+        }, coalesce=True)
+        return self._make_list(resp, 'stats', AsyncStat, result_mode)
+
+    async def iter_application_stats(self, page_size=100, read_ahead=1, result_mode=None):
+        """
+        Перебрати статистику по днях посторінково.
+        Поки обробляється поточна сторінка, наступні вже завантажуються
+
+        :param page_size: Скільки записів завантажувати за один запит
+        :param read_ahead: Скільки наступних сторінок завантажувати наперед
+        :param result_mode: 'model', 'dict' або 'record' (за замовчуванням – налаштування конектора)
+
+        :return: AsyncIterator[Stat]
+        """
+        async for page in self._iter_pages(self.application_stats_list, page_size, read_ahead, result_mode=result_mode):
+            for item in page:
+                yield item
 
     async def application_get(self):
         """
@@ -249,8 +491,8 @@ class AsyncHiExConnector(HiExConnectorBase):
         :return: Application
         """
         from ..types.async_types import AsyncApplication
-        resp = await self.get_async_request('application/get', {})
-        return AsyncApplication(connector=self, **resp['application'])
+        resp = await self.get_async_request('application/get', {}, coalesce=True)
+        return self._make(AsyncApplication, resp['application'])
 
     async def application_interest_set(self, interest):
         """
@@ -263,7 +505,7 @@ class AsyncHiExConnector(HiExConnectorBase):
         resp = await self.get_async_request('application/interest/set', {
             'interest': interest,
         })
-        return Decimal(resp['interest'])
+        return to_decimal(resp['interest'])
 
     async def user_get(self, auth_key):
         """
@@ -276,16 +518,17 @@ class AsyncHiExConnector(HiExConnectorBase):
         from ..types.async_types import AsyncUserWithAuthKey
         resp = await self.get_async_request('user/get', {
             'auth_key': auth_key,
-        })
-        return AsyncUserWithAuthKey(connector=self, auth_key=auth_key, **resp['user'])
+        }, coalesce=True)
+        return self._make(AsyncUserWithAuthKey, resp['user'], auth_key=auth_key)
 
-    async def user_referrals_list(self, auth_key, limit=Empty, offset=Empty):
+    async def user_referrals_list(self, auth_key, limit=Empty, offset=Empty, result_mode=None):
         """
         Завантажити список рефералів
 
         :param auth_key: Ключ користувача
         :param limit: Скільки рефералів завантажувати
         :param offset: Починати з рядку
+        :param result_mode: 'model', 'dict' або 'record' (за замовчуванням – налаштування конектора)
 
         :return: list
         """
@@ -294,12 +537,47 @@ class AsyncHiExConnector(HiExConnectorBase):
             'auth_key': auth_key,
             'limit': limit,
             'offset': offset,
-        })
-        referrals = ResponseList()
-        referrals.is_all = resp['is_all']
-        for referral in resp['referrals']:
-            referrals.append(AsyncReferral(connector=self, **referral))
-        return referrals
+        }, coalesce=True)
+        return self._make_list(resp, 'referrals', AsyncReferral, result_mode)
+
+    async def iter_user_referrals(self, auth_key, page_size=100, read_ahead=1, result_mode=None):
+        """
+        Перебрати всіх рефералів користувача посторінково.
+        Поки обробляється поточна сторінка, наступні вже завантажуються
+
+        :param auth_key: Ключ користувача
+        :param page_size: Скільки записів завантажувати за один запит
+        :param read_ahead: Скільки наступних сторінок завантажувати наперед
+        :param result_mode: 'model', 'dict' або 'record' (за замовчуванням – налаштування конектора)
+
+        :return: AsyncIterator[Referral]
+        """
+        async for page in self._iter_pages(
+                self.user_referrals_list, page_size, read_ahead, auth_key=auth_key, result_mode=result_mode,
+        ):
+            for item in page:
+                yield item
+
+    async def stream_user_referrals(self, auth_key, limit=Empty, offset=Empty, result_mode=None):
+        """
+        Завантажити список рефералів як потік.
+        Елементи розбираються з відповіді по одному, тому пам'ять не залежить від limit
+
+        :param auth_key: Ключ користувача
+        :param limit: Скільки рефералів завантажувати
+        :param offset: Починати з рядку
+        :param result_mode: 'model', 'dict' або 'record' (за замовчуванням – налаштування конектора)
+
+        :return: AsyncIterator[Referral]
+        """
+        from ..types.async_types import AsyncReferral
+        build = self._item_builder(AsyncReferral, result_mode)
+        async for item in self.stream_async_request('user/referrals/list', {
+            'auth_key': auth_key,
+            'limit': limit,
+            'offset': offset,
+        }, 'referrals'):
+            yield build(item)
 
     async def user_logout(self, auth_key):
         """
@@ -332,25 +610,22 @@ class AsyncHiExConnector(HiExConnectorBase):
             'option': option,
             'return_url': return_url,
         })
-        return AsyncVerification(connector=self, **resp['verification'])
+        return self._make(AsyncVerification, resp['verification'])
 
-    async def user_kyc_methods_list(self, auth_key):
+    async def user_kyc_methods_list(self, auth_key, result_mode=None):
         """
         Завантажити можливі способи проходження верифікації
 
         :param auth_key: Ключ користувача
+        :param result_mode: 'model', 'dict' або 'record' (за замовчуванням – налаштування конектора)
 
         :return: ResponseList[VerificationService]
         """
         from ..types.async_types import AsyncVerificationService
         resp = await self.get_async_request('user/kyc/methods/list', {
             'auth_key': auth_key,
-        })
-        verification_services = ResponseList()
-        verification_services.is_all = resp['is_all']
-        for method in resp['methods']:
-            verification_services.append(AsyncVerificationService(connector=self, **method))
-        return verification_services
+        }, coalesce=True)
+        return self._make_list(resp, 'methods', AsyncVerificationService, result_mode)
 
     async def user_auth(self, email, referral_token=Empty):
         """
@@ -366,7 +641,7 @@ class AsyncHiExConnector(HiExConnectorBase):
             'email': email,
             'referral_token': referral_token,
         })
-        return AsyncAuth(connector=self, **resp['auth'])
+        return self._make(AsyncAuth, resp['auth'])
 
     async def user_auth_code(self, auth_key, code):
         """
@@ -382,7 +657,7 @@ class AsyncHiExConnector(HiExConnectorBase):
             'auth_key': auth_key,
             'code': code,
         })
-        return AsyncAuth(connector=self, **resp['auth'])
+        return self._make(AsyncAuth, resp['auth'])
 
     async def user_exchange_create(
             self, auth_key, currency1, currency2, address, tag=Empty, amount1=Empty, amount2=Empty, return_url=Empty,
@@ -424,9 +699,11 @@ class AsyncHiExConnector(HiExConnectorBase):
             'beneficiary_phone': beneficiary_phone,
             'validation': validation,
         })
-        return AsyncExchangeWithAuthKey(connector=self, auth_key=auth_key, **resp['exchange']) if resp['exchange'] else None
+        return self._make(AsyncExchangeWithAuthKey, resp['exchange'], auth_key=auth_key) if resp['exchange'] else None
 
-    async def user_exchanges_list(self, auth_key, limit=Empty, offset=Empty, status_list=Empty, short_exchange_id=Empty):
+    async def user_exchanges_list(
+            self, auth_key, limit=Empty, offset=Empty, status_list=Empty, short_exchange_id=Empty, result_mode=None,
+    ):
         """
         Отримати список обмінів користувача (за вибіркою)
 
@@ -435,6 +712,7 @@ class AsyncHiExConnector(HiExConnectorBase):
         :param offset: Починати з рядку
         :param status_list: Список статусів
         :param short_exchange_id: Перші символи з exchange_id
+        :param result_mode: 'model', 'dict' або 'record' (за замовчуванням – налаштування конектора)
 
 
         :return: ResponseList[Exchange]
@@ -446,12 +724,61 @@ class AsyncHiExConnector(HiExConnectorBase):
             'offset': offset,
             'status_list': status_list,
             'short_exchange_id': short_exchange_id,
-        })
-        exchanges = ResponseList()
-        exchanges.is_all = resp['is_all']
-        for exchange in resp['exchanges']:
-            exchanges.append(AsyncExchangeWithAuthKey(connector=self, auth_key=auth_key, **exchange))
-        return exchanges
+        }, coalesce=True)
+        return self._make_list(resp, 'exchanges', AsyncExchangeWithAuthKey, result_mode, auth_key=auth_key)
+
+    async def iter_user_exchanges(self, auth_key, status_list=Empty, short_exchange_id=Empty, page_size=100, read_ahead=1, result_mode=None):
+        """
+        Перебрати всі обміни користувача посторінково.
+        Поки обробляється поточна сторінка, наступні вже завантажуються
+
+        :param auth_key: Ключ користувача
+        :param status_list: Список статусів
+        :param short_exchange_id: Перші символи з exchange_id
+        :param page_size: Скільки записів завантажувати за один запит
+        :param read_ahead: Скільки наступних сторінок завантажувати наперед
+        :param result_mode: 'model', 'dict' або 'record' (за замовчуванням – налаштування конектора)
+
+        :return: AsyncIterator[Exchange]
+        """
+        async for page in self._iter_pages(
+                self.user_exchanges_list,
+                page_size,
+                read_ahead,
+                auth_key=auth_key,
+                status_list=status_list,
+                short_exchange_id=short_exchange_id,
+                result_mode=result_mode,
+        ):
+            for item in page:
+                yield item
+
+    async def stream_user_exchanges(
+            self, auth_key, limit=Empty, offset=Empty, status_list=Empty, short_exchange_id=Empty, result_mode=None,
+    ):
+        """
+        Отримати список обмінів користувача як потік.
+        Елементи розбираються з відповіді по одному, тому пам'ять не залежить від limit
+
+        :param auth_key: Ключ користувача
+        :param limit: Скільки обмінів завантажувати
+        :param offset: Починати з рядку
+        :param status_list: Список статусів
+        :param short_exchange_id: Перші символи з exchange_id
+        :param result_mode: 'model', 'dict' або 'record' (за замовчуванням – налаштування конектора)
+
+        :return: AsyncIterator[Exchange]
+        """
+        from ..types.async_types import AsyncExchangeWithAuthKey
+        build = self._item_builder(AsyncExchangeWithAuthKey, result_mode, auth_key=auth_key)
+        async for item in self.stream_async_request('user/exchanges/list', {
+            'auth_key': auth_key,
+            'limit': limit,
+            'offset': offset,
+            'status_list': status_list,
+            'short_exchange_id': short_exchange_id,
+        }, 'exchanges'):
+            yield build(item)
 
     async def user_data_save(self, auth_key, **kwargs):
         """
@@ -1,11 +1,19 @@
-from aiohttp.web import run_app
+import asyncio
+import logging
+from functools import lru_cache
+
+from aiohttp.web import run_app, AppRunner, TCPSite
 from aiohttp.web_app import Application
 from aiohttp.web_request import Request
 from aiohttp.web_response import json_response
 
 from ..async_connector import AsyncHiExConnector
+from .dedup import DedupStore, MemoryDedupStore, SQLiteDedupStore
+from .journal import SQLiteJournal
 from ..types import Exchange, User
 
+logger = logging.getLogger(__name__)
+
 
 class AsyncHiExNotifications:
     """
@@ -15,12 +23,36 @@ class AsyncHiExNotifications:
 
     Також є можливість використувати користувацький сервер.
     Для виклику обробників достатньо викликати update_user_handlers під час події
+
+    Щоб не блокувати потік, передай run=False, а далі:
+    - запусти сервер в поточному event loop через `await notifications.start()` (зупинити – `await notifications.stop()`)
+    - або зареєструй обробник в існуючому aiohttp.web.Application через `notifications.setup(app)`
+
+    Якщо вказати workers > 0, перевірені сповіщення потрапляють в чергу (до queue_size подій)
+    і підтверджуються одразу, а обробники виконуються паралельно в workers фонових задачах.
+    Коли черга заповнена, сервер відповідає 503, щоб hiex.io повторив сповіщення пізніше
+
+    Щоб не обробляти повторні сповіщення, передай dedup_store (MemoryDedupStore або SQLiteDedupStore).
+    Повтори (той самий метод, об'єкт, статус та підписаний час) підтверджуються без виклику обробників.
+    Ключ зберігається після того, як сповіщення прийняте (записане в журнал, поставлене в чергу або оброблене)
+
+    Якщо передати journal (SQLiteJournal), сповіщення записується на диск до підтвердження,
+    а необроблені після аварійного завершення сповіщення (та підтверджені сповіщення, обробка яких завершилась
+    помилкою) повторно обробляються під час наступного запуску сервера
     """
     connector: AsyncHiExConnector
     handlers: list
+    routes: dict
     host: str
     port: int
     url: str
+    runner: AppRunner = None
+    workers: int = 0
+    queue_size: int = 1000
+    drain_timeout: float = 10
+    queue: asyncio.Queue = None
+    dedup_store: DedupStore = None
+    journal: SQLiteJournal = None
 
     def __init__(
             self,
@@ -28,7 +60,13 @@ class AsyncHiExNotifications:
             handlers: list,
             host: str = '0.0.0.0',
             port: int = 8265,
-            url: str = '/'):
+            url: str = '/',
+            run: bool = True,
+            workers: int = 0,
+            queue_size: int = 1000,
+            drain_timeout: float = 10,
+            dedup_store: DedupStore = None,
+            journal: SQLiteJournal = None):
         if isinstance(connector, AsyncHiExConnector):
             self.connector = connector
         else:
@@ -36,58 +74,337 @@ class AsyncHiExNotifications:
         self.host = host
         self.port = port
         self.url = url
-        self.handlers = handlers
+        self.handlers = list(handlers)
+        self.routes = self.build_routes(handlers)
+        self.workers = workers
+        self.queue_size = queue_size
+        self.drain_timeout = drain_timeout
+        self.dedup_store = dedup_store
+        self.journal = journal
+        self.__worker_tasks = []
+        self.__replay_task = None
+        self.__accepting = set()
+
+        if run:
+            run_app(self.create_app(), host=self.host, port=self.port)
 
+    def create_app(self):
+        """
+        Створити aiohttp.web.Application з обробником сповіщень
+
+        :return: Application
+        """
         app = Application()
+        self.setup(app)
+        return app
+
+    def setup(self, app: Application):
+        """
+        Зареєструвати обробник сповіщень в існуючому aiohttp.web.Application
+
+        :param app: Application
+
+        :return: None
+        """
         app.router.add_get(self.url, self.app_handler)
         app.router.add_post(self.url, self.app_handler)
-        run_app(app, host=self.host, port=self.port)
+        if self.workers or self.journal is not None:
+            app.on_startup.append(self.__on_startup)
+            app.on_cleanup.append(self.__on_cleanup)
+
+    async def __on_startup(self, app: Application = None):
+        if self.workers:
+            self.queue = asyncio.Queue(self.queue_size)
+            self.__worker_tasks = [asyncio.ensure_future(self.__worker()) for _ in range(self.workers)]
+        if self.journal is not None:
+            self.__replay_task = asyncio.ensure_future(self.__replay(self.journal.pending()))
+
+    async def __on_cleanup(self, app: Application = None):
+        if self.__replay_task is not None:
+            self.__replay_task.cancel()
+            await asyncio.gather(self.__replay_task, return_exceptions=True)
+            self.__replay_task = None
+        if self.queue is not None:
+            try:
+                await asyncio.wait_for(self.queue.join(), self.drain_timeout)
+            except asyncio.TimeoutError:
+                pass
+        for task in self.__worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self.__worker_tasks, return_exceptions=True)
+        self.__worker_tasks = []
+        if self.journal is not None:
+            await self.journal.flush()
+
+    async def __replay(self, entries):
+        for entry_id, data in entries:
+            if self.workers:
+                await self.queue.put((data, entry_id))
+            else:
+                try:
+                    await self.__handle(data, entry_id)
+                except Exception:
+                    logger.exception('Failed to handle replayed notification %s', data.get('method'))
+
+    async def __worker(self):
+        while True:
+            data, entry_id = await self.queue.get()
+            try:
+                await self.__handle(data, entry_id)
+            except Exception:
+                logger.exception('Failed to handle notification %s', data.get('method'))
+            finally:
+                self.queue.task_done()
+
+    async def __handle(self, data, entry_id=None):
+        await self.dispatch(data)
+        # Запис журналу з помилкою обробки залишається і буде повторно оброблений під час наступного запуску
+        if entry_id is not None:
+            self.journal.done(entry_id)
+
+    async def start(self):
+        """
+        Запустити сервер в поточному event loop, не блокуючи його
+
+        :return: None
+        """
+        if self.runner is not None:
+            return
+        runner = AppRunner(self.create_app())
+        await runner.setup()
+        await TCPSite(runner, self.host, self.port).start()
+        self.runner = runner
+
+    async def stop(self):
+        """
+        Зупинити сервер, запущений через start()
+
+        :return: None
+        """
+        runner = self.runner
+        self.runner = None
+        if runner is not None:
+            await runner.cleanup()
 
     async def app_handler(self, request: Request):
-        await self.update_user_handlers(self.connector, await request.text(), request.headers, *self.handlers)
+        data = self.connector.get_valid_response(await request.read(), request.headers)
+        dedup_key = None
+        if self.dedup_store is not None:
+            dedup_key = self.get_dedup_key(data, request.headers)
+            if dedup_key in self.__accepting or await self.dedup_store.contains_async(dedup_key):
+                return json_response({"ok": True})
+            self.__accepting.add(dedup_key)
+        try:
+            return await self.__accept(data, dedup_key)
+        finally:
+            if dedup_key is not None:
+                self.__accepting.discard(dedup_key)
+
+    async def __accept(self, data, dedup_key):
+        # Ключ дедуплікації записується, лише коли сповіщення прийняте: інакше після збою між перевіркою
+        # та обробкою повтор від hiex.io вважався б дублікатом і сповіщення було б втрачене
+        if self.workers and self.queue.full():
+            return json_response({"ok": False}, status=503)
+        entry_id = None
+        if self.journal is not None:
+            entry_id = await self.journal.append(data)
+            await self.__remember(dedup_key)
+        if not self.workers:
+            try:
+                await self.__handle(data, entry_id)
+            except Exception:
+                # Сповіщення не підтверджено, hiex.io надішле його повторно – запис журналу не потрібен
+                if entry_id is not None:
+                    self.journal.done(entry_id)
+                    await self.__forget(dedup_key)
+                raise
+            if entry_id is None:
+                await self.__remember(dedup_key)
+            return json_response({"ok": True})
+        try:
+            self.queue.put_nowait((data, entry_id))
+        except asyncio.QueueFull:
+            if entry_id is not None:
+                self.journal.done(entry_id)
+                await self.__forget(dedup_key)
+            return json_response({"ok": False}, status=503)
+        if entry_id is None:
+            await self.__remember(dedup_key)
         return json_response({"ok": True})
 
+    async def __remember(self, dedup_key):
+        if dedup_key is None:
+            return
+        try:
+            await self.dedup_store.add_async(dedup_key)
+        except Exception:
+            # Сповіщення вже прийняте, тому помилка сховища не повинна призводити до відповіді з помилкою
+            logger.exception('Failed to store notification dedup key %s', dedup_key)
+
+    async def __forget(self, dedup_key):
+        if dedup_key is not None:
+            await self.dedup_store.discard_async(dedup_key)
+
+    def get_dedup_key(self, data: dict, headers):
+        """
+        Ключ сповіщення для дедуплікації: метод, об'єкт, статус та підписаний час
+
+        :param data: Дані сповіщення
+        :param headers: Заголовки запиту
+
+        :return: str
+        """
+        handlers = self.routes.get(data['method'])
+        event_key = handlers[0].event_key(data) if handlers else ()
+        return ':'.join(str(part) for part in (data['method'], *event_key, headers['X-APP-TIMESTAMP']))
+
     @staticmethod
-    async def update_user_handlers(connector: AsyncHiExConnector, request_data: str, headers, *handlers):
+    async def update_user_handlers(connector: AsyncHiExConnector, request_data, headers, *handlers):
         data = connector.get_valid_response(request_data, headers)
+        await AsyncHiExNotifications.dispatch_handlers(connector, data, *handlers)
+
+    @staticmethod
+    async def dispatch_handlers(connector: AsyncHiExConnector, data: dict, *handlers):
+        """
+        Викликати обробники для вже перевіреного сповіщення
+
+        :param connector: Асинхронний конектор
+        :param data: Дані сповіщення (результат get_valid_response)
+        :param handlers: Обробники
+
+        :return: None
+        """
+        routes = AsyncHiExNotifications.cached_routes(handlers)
+        await AsyncHiExNotifications.dispatch_routes(connector, data, routes)
+
+    @staticmethod
+    def build_routes(handlers, skip_unknown: bool = False):
+        """
+        Побудувати таблицю маршрутизації: метод події -> обробники
+
+        :param handlers: Обробники (нащадки AsyncHiExBaseUpdate з вказаним method)
+        :param skip_unknown: Пропускати обробники без method замість ValueError
+
+        :return: dict[str, list]
+        """
+        routes = {}
         for handler in handlers:
-            if data['method'] == 'exchange_update' and issubclass(handler, AsyncHiExExchangeUpdate):
-                exchange = Exchange(**data['exchange'])
-                h = handler(connector, exchange)
-                await h.handle()
-            elif data['method'] == 'user_kyc_reviewed' and issubclass(handler, AsyncHiExUserKYCReviewed):
-                user = User(**data['user'])
-                h = handler(connector, user)
-                await h.handle()
+            method = getattr(handler, 'method', None)
+            if method is None:
+                if skip_unknown:
+                    continue
+                raise ValueError(f'{handler.__name__} has no event method')
+            routes.setdefault(method, []).append(handler)
+        return routes
+
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def cached_routes(handlers: tuple):
+        """
+        Таблиця маршрутизації для dispatch_handlers: будується один раз для кожного набору обробників.
+        Обробники без method пропускаються
+
+        :param handlers: tuple обробників
+
+        :return: dict[str, list]
+        """
+        return AsyncHiExNotifications.build_routes(handlers, skip_unknown=True)
+
+    @staticmethod
+    async def dispatch_routes(connector: AsyncHiExConnector, data: dict, routes: dict):
+        for handler in routes.get(data['method'], ()):
+            h = handler.from_data(connector, data)
+            await h.handle()
+
+    def add_handler(self, handler):
+        """
+        Зареєструвати ще один обробник
+
+        :param handler: Нащадок AsyncHiExBaseUpdate
+
+        :return: None
+        """
+        self.handlers.append(handler)
+        for method, handlers in self.build_routes([handler]).items():
+            self.routes.setdefault(method, []).extend(handlers)
+
+    async def dispatch(self, data: dict):
+        """
+        Викликати зареєстровані обробники для вже перевіреного сповіщення
+
+        :param data: Дані сповіщення (результат get_valid_response)
+
+        :return: None
+        """
+        await self.dispatch_routes(self.connector, data, self.routes)
 
 
 class AsyncHiExBaseUpdate:
+    """
+    Базовий обробник події.
+    Щоб додати новий тип події, достатньо створити нащадка з method (назва події з data['method'])
+    та from_data, який створює обробник з даних сповіщення
+    """
     connector: AsyncHiExConnector
+    method: str = None
 
     def __init__(self, connector: AsyncHiExConnector):
         self.connector = connector
 
+    @classmethod
+    def from_data(cls, connector: AsyncHiExConnector, data: dict):
+        return cls(connector)
+
+    @classmethod
+    def event_key(cls, data: dict):
+        """
+        Ідентифікатор об'єкта події та його стан (для дедуплікації)
+
+        :param data: Дані сповіщення
+
+        :return: tuple
+        """
+        return ()
+
     async def handle(self):
         pass
 
 
 class AsyncHiExExchangeUpdate(AsyncHiExBaseUpdate):
     exchange: Exchange
+    method = 'exchange_update'
 
     def __init__(self, connector: AsyncHiExConnector, exchange: Exchange):
         super().__init__(connector)
         self.exchange = exchange
 
+    @classmethod
+    def from_data(cls, connector: AsyncHiExConnector, data: dict):
+        return cls(connector, Exchange(**data['exchange']))
+
+    @classmethod
+    def event_key(cls, data: dict):
+        return data['exchange']['exchange_id'], data['exchange']['status']
+
     async def handle(self):
         pass
 
 
 class AsyncHiExUserKYCReviewed(AsyncHiExBaseUpdate):
     user: User
+    method = 'user_kyc_reviewed'
 
     def __init__(self, connector: AsyncHiExConnector, user: User):
         super().__init__(connector)
         self.user = user
 
+    @classmethod
+    def from_data(cls, connector: AsyncHiExConnector, data: dict):
+        return cls(connector, User(**data['user']))
+
+    @classmethod
+    def event_key(cls, data: dict):
+        return data['user']['user_id'], data['user']['kyc']
+
     async def handle(self):
         pass
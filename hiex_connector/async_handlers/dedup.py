@@ -0,0 +1,177 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+class DedupStore(ABC):
+    """
+    Сховище ключів вже прийнятих сповіщень.
+    Ключ перевіряється через contains() під час отримання, а записується через add() лише після того,
+    як сповіщення прийняте (записане в журнал, поставлене в чергу або оброблене)
+    """
+    @abstractmethod
+    def contains(self, key: str) -> bool:
+        """
+        Чи є ключ у сховищі
+
+        :param key: Ключ сповіщення
+
+        :return: bool
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def add(self, key: str) -> bool:
+        """
+        Запам'ятати ключ
+
+        :param key: Ключ сповіщення
+
+        :return: bool – False, якщо такий ключ вже був
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def discard(self, key: str):
+        """
+        Забути ключ (наприклад, якщо обробка не вдалась і сповіщення потрібно обробити повторно)
+
+        :param key: Ключ сповіщення
+
+        :return: None
+        """
+        raise NotImplementedError
+
+    async def contains_async(self, key: str) -> bool:
+        """
+        contains() для виклику з event loop
+
+        :param key: Ключ сповіщення
+
+        :return: bool
+        """
+        return self.contains(key)
+
+    async def add_async(self, key: str) -> bool:
+        """
+        add() для виклику з event loop (сховища з записом на диск виконують його в окремому потоці)
+
+        :param key: Ключ сповіщення
+
+        :return: bool – False, якщо такий ключ вже був
+        """
+        return self.add(key)
+
+    async def discard_async(self, key: str):
+        """
+        discard() для виклику з event loop
+
+        :param key: Ключ сповіщення
+
+        :return: None
+        """
+        self.discard(key)
+
+
+class MemoryDedupStore(DedupStore):
+    """
+    Сховище в пам'яті: не більше maxsize ключів, кожен живе ttl секунд
+    """
+    maxsize: int
+    ttl: float
+
+    def __init__(self, maxsize: int = 100000, ttl: float = 86400):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.__keys = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def contains(self, key: str) -> bool:
+        now = time.monotonic()
+        with self.__lock:
+            added_at = self.__keys.get(key)
+            return added_at is not None and added_at > now - self.ttl
+
+    def add(self, key: str) -> bool:
+        now = time.monotonic()
+        with self.__lock:
+            while self.__keys:
+                oldest, added_at = next(iter(self.__keys.items()))
+                if added_at > now - self.ttl and len(self.__keys) < self.maxsize:
+                    break
+                del self.__keys[oldest]
+            if key in self.__keys:
+                return False
+            self.__keys[key] = now
+            return True
+
+    def discard(self, key: str):
+        with self.__lock:
+            self.__keys.pop(key, None)
+
+
+class SQLiteDedupStore(DedupStore):
+    """
+    Сховище в SQLite, щоб дедуплікація працювала і після перезапуску.
+    З event loop запис виконується в окремому потоці, без fsync на кожен ключ (synchronous=NORMAL):
+    після збою живлення можуть загубитись лише останні ключі, тобто повторно обробитись кілька сповіщень
+    """
+    path: str
+    ttl: float
+    prune_every: int
+
+    def __init__(self, path: str, ttl: float = 86400, prune_every: int = 1000):
+        """
+        :param path: Шлях до файлу бази
+        :param ttl: Скільки секунд зберігати ключ
+        :param prune_every: Як часто (кожні N нових ключів) видаляти застарілі ключі
+        """
+        self.path = path
+        self.ttl = ttl
+        self.prune_every = prune_every
+        self.__added = 0
+        self.__lock = threading.Lock()
+        self.__db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.__db.execute('PRAGMA journal_mode=WAL')
+        self.__db.execute('PRAGMA synchronous=NORMAL')
+        self.__db.execute('CREATE TABLE IF NOT EXISTS hiex_dedup (key TEXT PRIMARY KEY, created_at REAL NOT NULL)')
+        self.__executor = ThreadPoolExecutor(1)
+
+    def contains(self, key: str) -> bool:
+        with self.__lock:
+            row = self.__db.execute('SELECT created_at FROM hiex_dedup WHERE key = ?', (key,)).fetchone()
+        return row is not None and row[0] >= time.time() - self.ttl
+
+    def add(self, key: str) -> bool:
+        now = time.time()
+        with self.__lock:
+            self.__added += 1
+            if self.__added % self.prune_every == 0:
+                self.__db.execute('DELETE FROM hiex_dedup WHERE created_at < ?', (now - self.ttl,))
+            row = self.__db.execute('SELECT created_at FROM hiex_dedup WHERE key = ?', (key,)).fetchone()
+            if row is not None and row[0] >= now - self.ttl:
+                return False
+            self.__db.execute('INSERT OR REPLACE INTO hiex_dedup (key, created_at) VALUES (?, ?)', (key, now))
+            return True
+
+    def discard(self, key: str):
+        with self.__lock:
+            self.__db.execute('DELETE FROM hiex_dedup WHERE key = ?', (key,))
+
+    async def contains_async(self, key: str) -> bool:
+        return await asyncio.get_event_loop().run_in_executor(self.__executor, self.contains, key)
+
+    async def add_async(self, key: str) -> bool:
+        return await asyncio.get_event_loop().run_in_executor(self.__executor, self.add, key)
+
+    async def discard_async(self, key: str):
+        await asyncio.get_event_loop().run_in_executor(self.__executor, self.discard, key)
+
+    def close(self):
+        self.__executor.shutdown()
+        with self.__lock:
+            self.__db.close()
@@ -0,0 +1,138 @@
+import asyncio
+import logging
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import simplejson
+
+logger = logging.getLogger(__name__)
+
+
+class SQLiteJournal:
+    """
+    Журнал сповіщень в SQLite (WAL).
+
+    Сповіщення записується в журнал до підтвердження і видаляється після успішного виконання обробників.
+    Записи, які залишились після аварійного завершення процесу або помилки обробника, повторно обробляються
+    під час запуску.
+    Записи накопичуються commit_interval секунд і фіксуються одним комітом (одним fsync)
+    """
+    path: str
+    commit_interval: float
+
+    def __init__(self, path: str, commit_interval: float = 0.005):
+        """
+        :param path: Шлях до файлу журналу
+        :param commit_interval: Скільки секунд накопичувати записи перед комітом
+        """
+        self.path = path
+        self.commit_interval = commit_interval
+        self.__lock = threading.Lock()
+        self.__db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.__db.execute('PRAGMA journal_mode=WAL')
+        self.__db.execute('PRAGMA synchronous=FULL')
+        self.__db.execute(
+            'CREATE TABLE IF NOT EXISTS hiex_journal (id INTEGER PRIMARY KEY AUTOINCREMENT, data TEXT NOT NULL)'
+        )
+        self.__executor = ThreadPoolExecutor(1)
+        self.__appends = []
+        self.__done = []
+        self.__flush_task = None
+        self.__flush_waiting = False
+
+    def pending(self):
+        """
+        Необроблені записи
+
+        :return: list[(entry_id, data)]
+        """
+        with self.__lock:
+            rows = self.__db.execute('SELECT id, data FROM hiex_journal ORDER BY id').fetchall()
+        return [(entry_id, simplejson.loads(data, use_decimal=True)) for entry_id, data in rows]
+
+    async def append(self, data: dict):
+        """
+        Записати сповіщення. Повертається після того, як запис зафіксовано на диску
+
+        :param data: Дані сповіщення
+
+        :return: int – номер запису
+        """
+        future = asyncio.get_event_loop().create_future()
+        self.__appends.append((simplejson.dumps(data), future))
+        self.__schedule_flush()
+        return await future
+
+    def done(self, entry_id: int):
+        """
+        Позначити запис обробленим (буде видалено з журналу з наступним комітом)
+
+        :param entry_id: Номер запису
+
+        :return: None
+        """
+        self.__done.append(entry_id)
+        self.__schedule_flush()
+
+    async def flush(self):
+        """
+        Зафіксувати всі накопичені зміни
+
+        :return: None
+        """
+        if self.__flush_waiting and self.__flush_task is not asyncio.current_task():
+            self.__flush_task.cancel()
+            self.__flush_waiting = False
+        appends, self.__appends = self.__appends, []
+        done, self.__done = self.__done, []
+        if not appends and not done:
+            return
+        loop = asyncio.get_event_loop()
+        try:
+            entry_ids = await loop.run_in_executor(
+                self.__executor, self.__commit, [data for data, future in appends], done,
+            )
+        except Exception as e:
+            for data, future in appends:
+                if not future.done():
+                    future.set_exception(e)
+            raise
+        for (data, future), entry_id in zip(appends, entry_ids):
+            if not future.done():
+                future.set_result(entry_id)
+
+    def close(self):
+        self.__executor.shutdown()
+        with self.__lock:
+            self.__db.close()
+
+    def __schedule_flush(self):
+        if self.__flush_task is None or self.__flush_task.done():
+            self.__flush_task = asyncio.ensure_future(self.__delayed_flush())
+
+    async def __delayed_flush(self):
+        self.__flush_waiting = True
+        await asyncio.sleep(self.commit_interval)
+        self.__flush_waiting = False
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception('Failed to commit notification journal')
+        if self.__appends or self.__done:
+            self.__flush_task = asyncio.ensure_future(self.__delayed_flush())
+
+    def __commit(self, appends, done):
+        with self.__lock:
+            self.__db.execute('BEGIN')
+            try:
+                entry_ids = [
+                    self.__db.execute('INSERT INTO hiex_journal (data) VALUES (?)', (data,)).lastrowid
+                    for data in appends
+                ]
+                self.__db.executemany('DELETE FROM hiex_journal WHERE id = ?', [(entry_id,) for entry_id in done])
+                self.__db.execute('COMMIT')
+            except Exception:
+                self.__db.execute('ROLLBACK')
+                raise
+        return entry_ids
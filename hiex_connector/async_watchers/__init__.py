@@ -0,0 +1,420 @@
+import asyncio
+import heapq
+import logging
+import time
+from collections import deque
+
+from ..async_connector import AsyncHiExConnector
+from ..types import RESULT_MODEL
+
+logger = logging.getLogger(__name__)
+
+
+async def _notify(subscribers, exchange, old_status, new_status):
+    """
+    Повідомити підписників про зміну статусу. Помилка одного підписника не заважає іншим
+    """
+    for callback in list(subscribers):
+        try:
+            await callback(exchange, old_status, new_status)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception('Subscriber %r failed on exchange %s', callback, exchange.exchange_id)
+
+
+class ExchangeWatcher:
+    """
+    Відстежує зміни багатьох обмінів одночасно.
+
+    Замість exchange.reload() для кожного обміну, оновлює всі відстежувані обміни пакетами
+    через application_exchanges_list (або exchanges_list) з фільтром status_list.
+    Обміни, які вийшли за межі фільтру, довантажуються через exchange_get.
+    Відстежувані екземпляри AsyncExchange оновлюються на місці, а підписники отримують
+    зміни статусу: `async def callback(exchange, old_status, new_status)`
+    """
+    connector: AsyncHiExConnector
+    interval: float
+    status_list: list
+    final_statuses: set
+    page_size: int
+    application: bool
+
+    def __init__(
+            self,
+            connector: AsyncHiExConnector,
+            interval: float = 5,
+            status_list: list = None,
+            final_statuses=(),
+            page_size: int = 100,
+            application: bool = True,
+    ):
+        """
+        :param connector: Асинхронний конектор
+        :param interval: Скільки секунд чекати між оновленнями
+        :param status_list: Статуси для фільтру списку (за замовчуванням – поточні статуси відстежуваних обмінів)
+        :param final_statuses: Статуси, після яких обмін перестає відстежуватись
+        :param page_size: Скільки обмінів завантажувати за один запит
+        :param application: Використовувати application_exchanges_list, інакше – exchanges_list
+        """
+        self.connector = connector
+        self.interval = interval
+        self.status_list = status_list
+        self.final_statuses = set(final_statuses)
+        self.page_size = page_size
+        self.application = application
+        self.__exchanges = {}
+        self.__subscribers = []
+        self.__task = None
+
+    @property
+    def exchanges(self):
+        """
+        Відстежувані обміни
+
+        :return: list[Exchange]
+        """
+        return list(self.__exchanges.values())
+
+    def watch(self, *exchanges):
+        """
+        Почати відстежувати обміни
+
+        :param exchanges: AsyncExchange
+
+        :return: None
+        """
+        for exchange in exchanges:
+            self.__exchanges[exchange.exchange_id] = exchange
+
+    def unwatch(self, *exchange_ids):
+        """
+        Припинити відстежувати обміни
+
+        :param exchange_ids: Номери обмінів
+
+        :return: None
+        """
+        for exchange_id in exchange_ids:
+            self.__exchanges.pop(exchange_id, None)
+
+    def subscribe(self, callback):
+        """
+        Підписатись на зміни статусів
+
+        :param callback: async def callback(exchange, old_status, new_status)
+
+        :return: None
+        """
+        self.__subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        self.__subscribers.remove(callback)
+
+    async def refresh(self):
+        """
+        Оновити всі відстежувані обміни
+
+        :return: list[(exchange, old_status, new_status)] – зміни статусів
+        """
+        pending = dict(self.__exchanges)
+        if not pending:
+            return []
+        changes = []
+        status_list = self.status_list or sorted({exchange.status for exchange in pending.values()})
+        # Відстежувані обміни оновлюються з моделей, незалежно від result_mode конектора
+        if self.application:
+            fresh_exchanges = self.connector.iter_application_exchanges(
+                status_list=status_list, page_size=self.page_size, result_mode=RESULT_MODEL,
+            )
+        else:
+            fresh_exchanges = self.connector.iter_exchanges(
+                status_list=status_list, page_size=self.page_size, result_mode=RESULT_MODEL,
+            )
+        try:
+            async for fresh in fresh_exchanges:
+                exchange = pending.pop(fresh.exchange_id, None)
+                if exchange is not None:
+                    self.__apply(exchange, fresh, changes)
+                    if not pending:
+                        break
+        finally:
+            await fresh_exchanges.aclose()
+
+        if pending:
+            results = await asyncio.gather(
+                *[self.connector.exchange_get(exchange_id) for exchange_id in pending],
+                return_exceptions=True,
+            )
+            for exchange, fresh in zip(pending.values(), results):
+                if isinstance(fresh, Exception):
+                    logger.warning('Failed to reload exchange %s: %r', exchange.exchange_id, fresh)
+                else:
+                    self.__apply(exchange, fresh, changes)
+
+        # Обміни вже оновлені на місці, тому спочатку знімаються з відстеження, а потім повідомляються підписники
+        for exchange, old_status, new_status in changes:
+            if new_status in self.final_statuses:
+                self.unwatch(exchange.exchange_id)
+        for exchange, old_status, new_status in changes:
+            await _notify(self.__subscribers, exchange, old_status, new_status)
+        return changes
+
+    @staticmethod
+    def __apply(exchange, fresh, changes):
+        old_status = exchange.status
+        if exchange.refresh_from(fresh) and exchange.status != old_status:
+            changes.append((exchange, old_status, exchange.status))
+
+    def start(self):
+        """
+        Запустити періодичне оновлення у фоновій задачі
+
+        :return: None
+        """
+        if self.__task is None or self.__task.done():
+            self.__task = asyncio.ensure_future(self.__run())
+
+    async def stop(self):
+        """
+        Зупинити періодичне оновлення
+
+        :return: None
+        """
+        task = self.__task
+        self.__task = None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def __run(self):
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception('Failed to refresh watched exchanges')
+            await asyncio.sleep(self.interval)
+
+
+class ExchangePollScheduler:
+    """
+    Планувальник оновлень обмінів через exchange.reload().
+
+    Кожен статус має власний інтервал оновлення (status_intervals). Поки обмін не змінюється,
+    інтервал збільшується в backoff_factor разів (не більше max_interval), після зміни – скидається.
+    Загальна кількість запитів обмежена max_rate запитами в секунду.
+    Підписники отримують зміни статусу: `async def callback(exchange, old_status, new_status)`
+    """
+    status_intervals: dict
+    default_interval: float
+    backoff_factor: float
+    max_interval: float
+    max_rate: float
+    final_statuses: set
+    rate_window: float
+
+    def __init__(
+            self,
+            status_intervals: dict = None,
+            default_interval: float = 5,
+            backoff_factor: float = 2,
+            max_interval: float = 300,
+            max_rate: float = 10,
+            final_statuses=(),
+            rate_window: float = 10,
+    ):
+        """
+        :param status_intervals: Інтервал оновлення (в секундах) для кожного статусу
+        :param default_interval: Інтервал для статусів, яких немає в status_intervals
+        :param backoff_factor: У скільки разів збільшувати інтервал, поки обмін не змінюється
+        :param max_interval: Максимальний інтервал
+        :param max_rate: Максимальна кількість запитів в секунду
+        :param final_statuses: Статуси, після яких обмін перестає відстежуватись
+        :param rate_window: За скільки останніх секунд рахувати request_rate
+        """
+        self.status_intervals = status_intervals or {}
+        self.default_interval = default_interval
+        self.backoff_factor = backoff_factor
+        self.max_interval = max_interval
+        self.max_rate = max_rate
+        self.final_statuses = set(final_statuses)
+        self.rate_window = rate_window
+        self.__entries = {}
+        self.__queue = []
+        self.__seq = 0
+        self.__subscribers = []
+        self.__requests = deque()
+        self.__next_slot = 0
+        self.__wakeup = None
+        self.__task = None
+        self.__reloads = set()
+
+    @property
+    def exchanges(self):
+        """
+        Відстежувані обміни
+
+        :return: list[Exchange]
+        """
+        return [entry[0] for entry in self.__entries.values()]
+
+    @property
+    def queue_depth(self):
+        """
+        Скільки обмінів вже потрібно оновити, але вони чекають своєї черги
+
+        :return: int
+        """
+        now = time.monotonic()
+        return sum(1 for due, seq, exchange_id in self.__queue if due <= now and self.__is_actual(seq, exchange_id))
+
+    @property
+    def request_rate(self):
+        """
+        Фактична кількість запитів в секунду за останні rate_window секунд
+
+        :return: float
+        """
+        self.__trim_requests(time.monotonic())
+        return len(self.__requests) / self.rate_window
+
+    def watch(self, *exchanges):
+        """
+        Почати відстежувати обміни. Перше оновлення – через інтервал їх поточного статусу
+
+        :param exchanges: AsyncExchange
+
+        :return: None
+        """
+        for exchange in exchanges:
+            interval = self.__status_interval(exchange.status)
+            self.__entries[exchange.exchange_id] = [exchange, interval, None]
+            self.__schedule(exchange.exchange_id, interval)
+
+    def unwatch(self, *exchange_ids):
+        """
+        Припинити відстежувати обміни
+
+        :param exchange_ids: Номери обмінів
+
+        :return: None
+        """
+        for exchange_id in exchange_ids:
+            self.__entries.pop(exchange_id, None)
+
+    def subscribe(self, callback):
+        """
+        Підписатись на зміни статусів
+
+        :param callback: async def callback(exchange, old_status, new_status)
+
+        :return: None
+        """
+        self.__subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        self.__subscribers.remove(callback)
+
+    def start(self):
+        """
+        Запустити планувальник у фоновій задачі
+
+        :return: None
+        """
+        if self.__task is None or self.__task.done():
+            self.__wakeup = asyncio.Event()
+            self.__task = asyncio.ensure_future(self.__run())
+
+    async def stop(self):
+        """
+        Зупинити планувальник та поточні оновлення
+
+        :return: None
+        """
+        tasks = list(self.__reloads)
+        if self.__task is not None:
+            tasks.append(self.__task)
+        self.__task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def __status_interval(self, status):
+        return self.status_intervals.get(status, self.default_interval)
+
+    def __schedule(self, exchange_id, interval):
+        self.__seq += 1
+        self.__entries[exchange_id][2] = self.__seq
+        heapq.heappush(self.__queue, (time.monotonic() + interval, self.__seq, exchange_id))
+        if self.__wakeup is not None:
+            self.__wakeup.set()
+
+    def __is_actual(self, seq, exchange_id):
+        entry = self.__entries.get(exchange_id)
+        return entry is not None and entry[2] == seq
+
+    def __trim_requests(self, now):
+        while self.__requests and self.__requests[0] <= now - self.rate_window:
+            self.__requests.popleft()
+
+    async def __run(self):
+        while True:
+            if not self.__queue:
+                self.__wakeup.clear()
+                await self.__wakeup.wait()
+                continue
+            due, seq, exchange_id = self.__queue[0]
+            if not self.__is_actual(seq, exchange_id):
+                heapq.heappop(self.__queue)
+                continue
+            delay = due - time.monotonic()
+            if delay > 0:
+                self.__wakeup.clear()
+                try:
+                    await asyncio.wait_for(self.__wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            heapq.heappop(self.__queue)
+
+            now = time.monotonic()
+            delay = self.__next_slot - now
+            self.__next_slot = max(now, self.__next_slot) + 1 / self.max_rate
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if not self.__is_actual(seq, exchange_id):
+                continue
+            task = asyncio.ensure_future(self.__reload(exchange_id))
+            self.__reloads.add(task)
+            task.add_done_callback(self.__reloads.discard)
+
+    async def __reload(self, exchange_id):
+        entry = self.__entries[exchange_id]
+        exchange, interval = entry[0], entry[1]
+        old_status = exchange.status
+        self.__requests.append(time.monotonic())
+        self.__trim_requests(time.monotonic())
+        try:
+            await exchange.reload()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception('Failed to reload exchange %s', exchange_id)
+        if exchange_id not in self.__entries:
+            return
+        new_status = exchange.status
+        if new_status == old_status:
+            entry[1] = min(interval * self.backoff_factor, self.max_interval)
+        else:
+            entry[1] = self.__status_interval(new_status)
+        if new_status in self.final_statuses:
+            self.unwatch(exchange_id)
+        else:
+            self.__schedule(exchange_id, entry[1])
+        if new_status != old_status:
+            await _notify(self.__subscribers, exchange, old_status, new_status)
@@ -3,73 +3,710 @@ import os
 import requests
 import hashlib
 import hmac
-import simplejson
 import time
 import aiohttp
+import asyncio
+import contextvars
+import threading
+import tempfile
+from contextlib import nullcontext
+from requests.adapters import HTTPAdapter
 from contextvars import ContextVar
 from ..version import __version__
 from ..exceptions import *
-from ..types import Empty
+from ..types import (
+    Empty, ResponseList, Currency, Pair, RESULT_MODEL, RESULT_DICT, RESULT_RECORD, get_record_type, get_currency_fields,
+)
+from ..cache import CatalogCache, CurrencyRegistry
+from ..codecs import JsonCodec, SimpleJsonCodec, iter_json_array
+from ..policies import (
+    RateLimiter, RetryPolicy, CircuitBreaker, HedgePolicy, HiExTimeout, timeout_context_var,
+    deadline_context_var as default_deadline_context_var,
+)
+
+
+class _InFlight:
+    """
+    Спільний запит, який чекають waiters викликів
+    """
+    __slots__ = ('future', 'waiters')
+
+    def __init__(self, future):
+        self.future = future
+        self.waiters = 0
 
 
 class HiExConnectorBase:
     __private_key: str = ''
+    __hmac = None
     __public_key: str = ''
     __basic_url: str = 'https://api.hiex.io/'
     __lang: str = None
     __lang_context_var: ContextVar = None
+    __async_session: aiohttp.ClientSession = None
+    __async_session_loop: asyncio.AbstractEventLoop = None
+    __pool_limit: int = 100
+    __pool_limit_per_host: int = 0
+    __keepalive_timeout: float = 15
+    __session: requests.Session = None
+    __session_lock: threading.Lock = None
+    __pool_connections: int = 10
+    __pool_maxsize: int = 10
+    __catalog_cache: CatalogCache = None
+    __background_tasks: set = None
+    __local_quotes_max_age: float = None
+    __pairs: dict = None
+    __in_flight: dict = None
+    __codec: JsonCodec = None
+    __result_mode: str = RESULT_MODEL
+    __trusted_construction: bool = False
+    __currencies: CurrencyRegistry = None
+    __stream_spool_size: int = 1024 * 1024
+    __rate_limiter: RateLimiter = None
+    __retry_policy: RetryPolicy = None
+    __circuit_breaker: CircuitBreaker = None
+    __hedge_policy: HedgePolicy = None
+    __timeout: HiExTimeout = None
+    __deadline_context_var: ContextVar = None
 
-    def __init__(self, private_key, public_key, base_url=None, lang=None, lang_context_var: ContextVar = None):
+    def __init__(
+            self,
+            private_key,
+            public_key,
+            base_url=None,
+            lang=None,
+            lang_context_var: ContextVar = None,
+            pool_limit: int = 100,
+            pool_limit_per_host: int = 0,
+            keepalive_timeout: float = 15,
+            pool_connections: int = 10,
+            pool_maxsize: int = 10,
+            catalog_ttl: float = None,
+            catalog_stale_ttl: float = 600,
+            local_quotes_max_age: float = None,
+            codec: JsonCodec = None,
+            result_mode: str = RESULT_MODEL,
+            trusted_construction: bool = False,
+            stream_spool_size: int = 1024 * 1024,
+            rate_limiter: RateLimiter = None,
+            retry_policy: RetryPolicy = None,
+            circuit_breaker: CircuitBreaker = None,
+            hedge_policy: HedgePolicy = None,
+            timeout: HiExTimeout = None,
+            deadline_context_var: ContextVar = None,
+    ):
+        """
+        :param private_key: Приватний ключ
+        :param public_key: Публічний ключ
+        :param base_url: URL api
+        :param lang: Мова відповідей
+        :param lang_context_var: ContextVar з мовою відповідей (має пріоритет над lang)
+        :param pool_limit: Максимальна кількість з'єднань в пулі (0 – без обмежень)
+        :param pool_limit_per_host: Максимальна кількість з'єднань до одного хоста (0 – без обмежень)
+        :param keepalive_timeout: Скільки секунд тримати невикористане з'єднання відкритим
+        :param pool_connections: Кількість пулів з'єднань синхронного конектора (по одному на хост)
+        :param pool_maxsize: Максимальна кількість з'єднань в пулі синхронного конектора
+        :param catalog_ttl: Скільки секунд кешувати currencies_list та pairs_list (None – не кешувати)
+        :param catalog_stale_ttl: Скільки секунд після catalog_ttl віддавати застарілий каталог, поки він оновлюється
+        :param local_quotes_max_age: Рахувати pair_amount локально за даними з pairs_list, якщо вони не старші
+            за вказану кількість секунд (None – завжди запитувати api)
+        :param codec: Кодек JSON (за замовчуванням SimpleJsonCodec, швидший варіант – OrjsonCodec)
+        :param result_mode: Як повертати елементи списків: 'model' – моделі з валідацією, 'dict' – словники,
+            'record' – легкі записи з __slots__ (без валідації). Можна змінити для окремого виклику
+        :param trusted_construction: Створювати моделі з відповідей з перевіреним підписом без повторної валідації
+            pydantic (BaseType.construct_trusted)
+        :param stream_spool_size: Скільки байт відповіді stream_* тримати в пам'яті, решта записується у тимчасовий файл
+        :param rate_limiter: Обмеження частоти запитів (RateLimiter, можна спільний для кількох конекторів)
+        :param retry_policy: Повтори після тимчасових помилок (за замовчуванням RetryPolicy(), без повторів –
+            RetryPolicy(attempts=1))
+        :param circuit_breaker: Запобіжники для методів api (CircuitBreaker): під час збоїв api запити одразу
+            завершуються CircuitOpenError
+        :param hedge_policy: Дублювати повільні запити на читання (HedgePolicy, тільки асинхронний конектор)
+        :param timeout: Тайм-аути запитів (за замовчуванням HiExTimeout(total=60, connect=10))
+        :param deadline_context_var: ContextVar з дедлайном запитів – значенням time.monotonic()
+            (за замовчуванням policies.deadline_context_var, який встановлює deadline())
+        """
         self.__private_key = private_key
+        self.__hmac = hmac.new(private_key.encode('utf-8'), digestmod=hashlib.sha256)
         self.__public_key = public_key
         if base_url is not None:
             self.__basic_url = base_url
         self.__lang = lang
         self.__lang_context_var = lang_context_var
+        self.__pool_limit = pool_limit
+        self.__pool_limit_per_host = pool_limit_per_host
+        self.__keepalive_timeout = keepalive_timeout
+        self.__session_lock = threading.Lock()
+        self.__pool_connections = pool_connections
+        self.__pool_maxsize = pool_maxsize
+        if catalog_ttl is not None:
+            self.__catalog_cache = CatalogCache(catalog_ttl, catalog_stale_ttl)
+        self.__background_tasks = set()
+        self.__local_quotes_max_age = local_quotes_max_age
+        self.__pairs = {}
+        self.__in_flight = {}
+        self.__codec = codec if codec is not None else SimpleJsonCodec()
+        self.__result_mode = result_mode
+        self.__trusted_construction = trusted_construction
+        self.__currencies = CurrencyRegistry(self.__build_currency)
+        self.__stream_spool_size = stream_spool_size
+        self.__rate_limiter = rate_limiter
+        self.__retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.__circuit_breaker = circuit_breaker
+        self.__hedge_policy = hedge_policy
+        self.__timeout = timeout if timeout is not None else HiExTimeout()
+        if deadline_context_var is None:
+            deadline_context_var = default_deadline_context_var
+        self.__deadline_context_var = deadline_context_var
 
     def get_request(self, method, data):
-        text, headers = self.get_request_data(method, data)
-        return self.get_valid_response(text, headers)
+        body = self._pre_request_data(data)
+        return self.__retry_policy.call(
+            method, lambda: self.get_valid_response(*self._post(method, body)), self.__deadline_context_var.get(),
+        )
 
     def get_request_data(self, method, data):
-        data = self._pre_request_data(data)
-        timestamp = str(time.time())
-        r = requests.post(
-            f'{self.__basic_url}{method}',
-            data=data,
-            headers={
-                'Content-type': 'application/json',
-                'X-APP-PUBLIC-KEY': self.__public_key,
-                'X-APP-TIMESTAMP': timestamp,
-                'X-APP-SIGNATURE': self._get_sign(data, timestamp),
-            }
-        )
-        return r.text, r.headers
+        body = self._pre_request_data(data)
+        return self.__retry_policy.call(method, lambda: self._post(method, body), self.__deadline_context_var.get())
 
-    async def get_async_request(self, method, data):
-        text, headers = await self.get_async_request_data(method, data)
-        return self.get_valid_response(text, headers)
+    def _post(self, method, data):
+        data = data.encode('utf-8')
+        if self.__circuit_breaker is not None:
+            self.__circuit_breaker.check(method)
+        if self.__rate_limiter is not None:
+            self.__rate_limiter.acquire(method, self.__deadline_context_var.get())
+        timeout = self._get_timeout()
+        with self._guard(method):
+            try:
+                r = self._get_session().post(
+                    f'{self.__basic_url}{method}',
+                    data=data,
+                    headers=self._get_headers(data),
+                    timeout=(timeout.connect, timeout.read),
+                )
+            except requests.exceptions.Timeout as e:
+                if timeout.deadline_bound:
+                    raise DeadlineExceeded(f'{method}: no response within {timeout.total:.3f}s') from e
+                raise
+            if r.status_code >= 500:
+                raise ServerError(r.reason, r.status_code)
+        return r.content, r.headers
 
-    async def get_async_request_data(self, method, data):
-        data = self._pre_request_data(data)
+    def _get_timeout(self):
+        """
+        Тайм-аути наступної спроби: use_timeout() або тайм-аути конектора, скорочені до дедлайну
+
+        :return: HiExTimeout
+        """
+        timeout = timeout_context_var.get() or self.__timeout
+        return timeout.for_deadline(self.__deadline_context_var.get())
+
+    def _guard(self, method):
+        """
+        Контекст запиту під захистом запобіжника (якщо вказано circuit_breaker)
+
+        :param method: Метод api
+
+        :return: ContextManager
+        """
+        if self.__circuit_breaker is None:
+            return nullcontext()
+        return self.__circuit_breaker.guard(method)
+
+    def _get_headers(self, data):
+        """
+        Заголовки запиту з підписом
+
+        :param data: Тіло запиту (bytes)
+
+        :return: dict
+        """
         timestamp = str(time.time())
-        headers = {
+        return {
             'Content-type': 'application/json',
             'X-APP-PUBLIC-KEY': self.__public_key,
             'X-APP-TIMESTAMP': timestamp,
             'X-APP-SIGNATURE': self._get_sign(data, timestamp),
         }
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                    f'{self.__basic_url}{method}',
-                    data=data,
-                    headers=headers,
-                    allow_redirects=True
-            ) as resp:
-                text = await resp.text()
-                return text, resp.headers
 
-    def _pre_request_data(self, data):
+    def _get_session(self):
+        """
+        Сесія з пулом з'єднань, створюється під час першого запиту.
+        Одну сесію можна використовувати з різних потоків
+
+        :return: requests.Session
+        """
+        session = self.__session
+        if session is None:
+            with self.__session_lock:
+                if self.__session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=self.__pool_connections, pool_maxsize=self.__pool_maxsize)
+                    session.mount('http://', adapter)
+                    session.mount('https://', adapter)
+                    self.__session = session
+                session = self.__session
+        return session
+
+    def _close_session(self):
+        with self.__session_lock:
+            session = self.__session
+            self.__session = None
+        if session is not None:
+            session.close()
+
+    async def get_async_request(self, method, data, coalesce=False):
+        """
+        Виконати запит до api
+
+        :param method: Метод api
+        :param data: Параметри запиту
+        :param coalesce: Об'єднати однакові одночасні запити в один (тільки для запитів на читання)
+
+        :return: dict
+        """
+        body = self._pre_request_data(data)
+        if not coalesce:
+            return await self.__send_async_request(method, body)
+        timeout = timeout_context_var.get()
+        if timeout is not None:
+            timeout = (timeout.total, timeout.connect, timeout.read)
+        key = (method, body, timeout)
+        in_flight = self.__in_flight.get(key)
+        if in_flight is None:
+            # Спільний запит не успадковує дедлайн першого викликаючого: кожен чекає його в межах власного дедлайну
+            context = contextvars.copy_context()
+            context.run(self.__deadline_context_var.set, None)
+            future = context.run(asyncio.ensure_future, self.__send_async_request(method, body))
+            in_flight = self.__in_flight[key] = _InFlight(future)
+            future.add_done_callback(lambda f: self.__forget_in_flight(key, in_flight))
+        in_flight.waiters += 1
+        try:
+            return await self.__wait_in_flight(method, in_flight.future)
+        finally:
+            # Запит, який більше ніхто не чекає (всі скасовані), скасовується
+            in_flight.waiters -= 1
+            if not in_flight.waiters and not in_flight.future.done():
+                in_flight.future.cancel()
+
+    async def __wait_in_flight(self, method, future):
+        deadline = self.__deadline_context_var.get()
+        if deadline is None:
+            return await asyncio.shield(future)
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise DeadlineExceeded(f'Deadline passed {-remaining:.3f}s ago')
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), remaining)
+        except asyncio.TimeoutError:
+            if future.done():
+                raise
+            raise DeadlineExceeded(f'{method}: no response within {remaining:.3f}s') from None
+
+    def __forget_in_flight(self, key, in_flight):
+        if self.__in_flight.get(key) is in_flight:
+            del self.__in_flight[key]
+        if not in_flight.future.cancelled():
+            in_flight.future.exception()
+
+    async def __send_async_request(self, method, body):
+        if self.__hedge_policy is not None and self.__hedge_policy.is_hedged(method):
+            send = self.__send_hedged_request
+        else:
+            send = self.__send_async_request_once
+        return await self.__retry_policy.call_async(
+            method, lambda: send(method, body), self.__deadline_context_var.get(),
+        )
+
+    async def __send_hedged_request(self, method, body):
+        """
+        Виконати запит, а якщо відповіді довго немає – надіслати дубль та взяти першу успішну відповідь
+        """
+        policy = self.__hedge_policy
+        policy.start()
+        started_at = time.monotonic()
+        primary = asyncio.ensure_future(self.__send_async_request_once(method, body))
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=policy.get_delay(method))
+            if not done and policy.try_hedge():
+                tasks.add(asyncio.ensure_future(self.__send_async_request_once(method, body)))
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        policy.record(method, time.monotonic() - started_at, task is not primary)
+                        return task.result()
+            return primary.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def __send_async_request_once(self, method, body):
+        body, headers = await self._post_async(method, body)
+        return self.get_valid_response(body, headers)
+
+    async def get_async_request_data(self, method, data):
+        body = self._pre_request_data(data)
+        return await self.__retry_policy.call_async(
+            method, lambda: self._post_async(method, body), self.__deadline_context_var.get(),
+        )
+
+    async def _post_async(self, method, data):
+        data = data.encode('utf-8')
+        if self.__circuit_breaker is not None:
+            self.__circuit_breaker.check(method)
+        if self.__rate_limiter is not None:
+            await self.__rate_limiter.acquire_async(method, self.__deadline_context_var.get())
+        timeout = self._get_timeout()
+        session = self._get_async_session()
+        with self._guard(method):
+            try:
+                async with session.post(
+                        f'{self.__basic_url}{method}',
+                        data=data,
+                        headers=self._get_headers(data),
+                        allow_redirects=True,
+                        timeout=self._get_client_timeout(timeout),
+                ) as resp:
+                    if resp.status >= 500:
+                        raise ServerError(resp.reason, resp.status)
+                    body = await resp.read()
+                    return body, resp.headers
+            except asyncio.TimeoutError as e:
+                if timeout.deadline_bound:
+                    raise DeadlineExceeded(f'{method}: no response within {timeout.total:.3f}s') from e
+                raise
+
+    @staticmethod
+    def _get_client_timeout(timeout):
+        return aiohttp.ClientTimeout(total=timeout.total, sock_connect=timeout.connect, sock_read=timeout.read)
+
+    async def stream_async_request(self, method, data, key, chunk_size=65536):
+        """
+        Виконати запит до api та повертати елементи списку з відповіді по одному.
+        Тіло відповіді записується у тимчасовий файл (до stream_spool_size байт – в пам'яті), підпис рахується
+        по блоках під час завантаження. Елементи розбираються тільки після перевірки підпису всієї відповіді
+
+        :param method: Метод api
+        :param data: Параметри запиту
+        :param key: Ключ списку у відповіді (наприклад 'exchanges')
+        :param chunk_size: Розмір блоку читання
+
+        :return: AsyncIterator[dict]
+        """
+        body = self._pre_request_data(data).encode('utf-8')
+        if self.__circuit_breaker is not None:
+            self.__circuit_breaker.check(method)
+        if self.__rate_limiter is not None:
+            await self.__rate_limiter.acquire_async(method, self.__deadline_context_var.get())
+        timeout = self._get_timeout()
+        session = self._get_async_session()
+        with tempfile.SpooledTemporaryFile(max_size=self.__stream_spool_size) as fp:
+            h = self.__hmac.copy()
+            with self._guard(method):
+                try:
+                    async with session.post(
+                            f'{self.__basic_url}{method}',
+                            data=body,
+                            headers=self._get_headers(body),
+                            allow_redirects=True,
+                            timeout=self._get_client_timeout(timeout),
+                    ) as resp:
+                        if resp.status >= 500:
+                            raise ServerError(resp.reason, resp.status)
+                        headers = resp.headers
+                        self.check_version(headers['X-APP-VERSION'])
+                        async for chunk in resp.content.iter_chunked(chunk_size):
+                            h.update(chunk)
+                            fp.write(chunk)
+                except asyncio.TimeoutError as e:
+                    if timeout.deadline_bound:
+                        raise DeadlineExceeded(f'{method}: no response within {timeout.total:.3f}s') from e
+                    raise
+            h.update(headers['X-APP-TIMESTAMP'].encode('utf-8'))
+            sign = h.hexdigest()
+            resp_sign = headers['X-APP-SIGNATURE']
+            if not hmac.compare_digest(resp_sign.encode('utf-8'), sign.encode('utf-8')):
+                raise ProcessingError(f'No verify hash {resp_sign}!={sign}')
+
+            fp.seek(0)
+            meta = {}
+            for item in iter_json_array(fp, key, meta, chunk_size):
+                yield item
+            self._raise_for_error(meta)
+
+    def _get_async_session(self):
+        """
+        Сесія з пулом з'єднань, створюється під час першого запиту в кожному циклі подій
+        (наприклад, після кожного asyncio.run)
+
+        :return: aiohttp.ClientSession
+        """
+        loop = asyncio.get_running_loop()
+        session = self.__async_session
+        if session is not None and self.__async_session_loop is not loop:
+            self.__drop_async_session(session)
+            session = None
+        if session is None or session.closed:
+            self.__async_session_loop = loop
+            self.__async_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.__pool_limit,
+                    limit_per_host=self.__pool_limit_per_host,
+                    keepalive_timeout=self.__keepalive_timeout,
+                ),
+            )
+        return self.__async_session
+
+    async def _close_async_session(self):
+        session = self.__async_session
+        self.__async_session = None
+        if session is None or session.closed:
+            return
+        if self.__async_session_loop is not asyncio.get_running_loop():
+            self.__drop_async_session(session)
+            return
+        await session.close()
+
+    @staticmethod
+    def __drop_async_session(session):
+        """
+        Закрити сесію іншого циклу подій без очікування (цикл може бути вже закритий)
+        """
+        if session.closed:
+            return
+        connector = session.connector
+        session.detach()
+        # В aiohttp 3.8 close() закриває пул синхронно через _close(), але повертає awaitable,
+        # який з іншого циклу подій неможливо дочекатися
+        connector._close()
+
+    def get_catalog(self, method, data, build, result_mode=None):
+        """
+        Виконати запит до каталогу з урахуванням кешу (якщо вказано catalog_ttl).
+        Застарілий запис оновлюється у фоновому потоці
+
+        :param method: Метод api
+        :param data: Параметри запиту
+        :param build: Функція, яка перетворює відповідь api на ResponseList
+        :param result_mode: Формат елементів, який повертає build (частина ключа кешу)
+
+        :return: ResponseList
+        """
+        cache = self.__catalog_cache
+        if cache is None:
+            return build(self.get_request(method, data))
+        key = self._catalog_key(method, data, result_mode or self.__result_mode)
+        value, state = cache.lookup(key)
+        if state == CatalogCache.STALE and cache.start_refresh(key):
+            context = contextvars.copy_context()
+            threading.Thread(
+                target=context.run,
+                args=(self.__refresh_catalog, cache, key, method, data, build),
+                daemon=True,
+            ).start()
+        if state == CatalogCache.MISS:
+            value = build(self.get_request(method, data))
+            cache.set(key, value)
+        return value.copy()
+
+    def __refresh_catalog(self, cache, key, method, data, build):
+        try:
+            cache.set(key, build(self.get_request(method, data)))
+        except Exception:
+            pass
+        finally:
+            cache.finish_refresh(key)
+
+    async def get_async_catalog(self, method, data, build, result_mode=None):
+        """
+        Виконати запит до каталогу з урахуванням кешу (якщо вказано catalog_ttl).
+        Застарілий запис оновлюється у фоновій задачі
+
+        :param method: Метод api
+        :param data: Параметри запиту
+        :param build: Функція, яка перетворює відповідь api на ResponseList
+        :param result_mode: Формат елементів, який повертає build (частина ключа кешу)
+
+        :return: ResponseList
+        """
+        cache = self.__catalog_cache
+        if cache is None:
+            return build(await self.get_async_request(method, data, coalesce=True))
+        key = self._catalog_key(method, data, result_mode or self.__result_mode)
+        value, state = cache.lookup(key)
+        if state == CatalogCache.STALE and cache.start_refresh(key):
+            self._add_background_task(asyncio.ensure_future(self.__refresh_async_catalog(cache, key, method, data, build)))
+        if state == CatalogCache.MISS:
+            value = build(await self.get_async_request(method, data, coalesce=True))
+            cache.set(key, value)
+        return value.copy()
+
+    async def __refresh_async_catalog(self, cache, key, method, data, build):
+        try:
+            cache.set(key, build(await self.get_async_request(method, data, coalesce=True)))
+        except Exception:
+            pass
+        finally:
+            cache.finish_refresh(key)
+
+    def invalidate_catalog(self, method=None):
+        """
+        Очистити кеш каталогів
+
+        :param method: Метод api ('currencies/list' або 'pairs/list'). Якщо не вказано – очистити весь кеш
+
+        :return: None
+        """
+        if self.__catalog_cache is not None:
+            self.__catalog_cache.invalidate(method)
+
+    def _catalog_key(self, method, data, result_mode):
+        params = tuple(sorted((key, value) for key, value in data.items() if value is not Empty))
+        return method, params, self._get_lang(), result_mode
+
+    def _add_background_task(self, task):
+        """
+        Запам'ятати фонову задачу, щоб скасувати її під час закриття конектора
+
+        :param task: asyncio.Task
+
+        :return: task
+        """
+        self.__background_tasks.add(task)
+        task.add_done_callback(self.__background_tasks.discard)
+        return task
+
+    def _cancel_background_tasks(self):
+        for task in list(self.__background_tasks):
+            task.cancel()
+        for in_flight in list(self.__in_flight.values()):
+            in_flight.future.cancel()
+
+    def _make_list(self, resp, key, model, result_mode=None, **extra):
+        """
+        Перетворити список з відповіді api на ResponseList
+
+        :param resp: Відповідь api
+        :param key: Ключ списку у відповіді
+        :param model: Модель елементів списку
+        :param result_mode: 'model', 'dict' або 'record' (за замовчуванням – налаштування конектора)
+        :param extra: Додаткові поля кожного елемента (наприклад auth_key)
+
+        :return: ResponseList
+        """
+        items = ResponseList(map(self._item_builder(model, result_mode, **extra), resp[key]))
+        items.is_all = resp['is_all']
+        return items
+
+    def _item_builder(self, model, result_mode=None, **extra):
+        """
+        Функція, що перетворює елемент списку з відповіді api на результат
+
+        :param model: Модель елементів списку
+        :param result_mode: 'model', 'dict' або 'record' (за замовчуванням – налаштування конектора)
+        :param extra: Додаткові поля кожного елемента (наприклад auth_key)
+
+        :return: Callable[[dict], Any]
+        """
+        result_mode = result_mode or self.__result_mode
+        if result_mode == RESULT_DICT:
+            if extra:
+                return lambda item: {**item, **extra}
+            return lambda item: item
+        if result_mode == RESULT_RECORD:
+            record_type = get_record_type(model)
+            return lambda item: record_type(**extra, **item)
+        build = model.construct_trusted if self.__trusted_construction else model
+        currency_fields = get_currency_fields(model)
+        if currency_fields:
+            return lambda item: build(connector=self, **extra, **self._intern_currencies(item, currency_fields))
+        return lambda item: build(connector=self, **extra, **item)
+
+    def _make(self, model, data, **extra):
+        """
+        Створити модель з об'єкта відповіді api
+
+        :param model: Нащадок BaseType
+        :param data: Об'єкт з відповіді
+        :param extra: Додаткові поля (наприклад auth_key)
+
+        :return: Екземпляр моделі
+        """
+        currency_fields = get_currency_fields(model)
+        if currency_fields:
+            data = self._intern_currencies(data, currency_fields)
+        if self.__trusted_construction:
+            return model.construct_trusted(connector=self, **extra, **data)
+        return model(connector=self, **extra, **data)
+
+    def _intern_currencies(self, data, currency_fields):
+        """
+        Замінити вкладені валюти об'єкта відповіді спільними екземплярами Currency
+
+        :param data: Об'єкт з відповіді api (не змінюється)
+        :param currency_fields: Поля з валютою
+
+        :return: dict
+        """
+        data = dict(data)
+        for key in currency_fields:
+            if key in data:
+                data[key] = self.__currencies.intern(data[key])
+        return data
+
+    def _remember_currencies(self, currencies):
+        """
+        Оновити спільні екземпляри валют даними з currencies_list
+
+        :param currencies: list[dict] – валюти з відповіді api
+
+        :return: None
+        """
+        self.__currencies.update(currencies)
+
+    def __build_currency(self, data):
+        if self.__trusted_construction:
+            return Currency.construct_trusted(**data)
+        return Currency(**data)
+
+    def _remember_pairs(self, resp, pairs, model):
+        """
+        Запам'ятати валютні пари для локального розрахунку pair_amount
+
+        :param resp: Відповідь pairs/list
+        :param pairs: ResponseList з відповіді (моделі, словники або записи)
+        :param model: Модель валютної пари
+
+        :return: None
+        """
+        if self.__local_quotes_max_age is None or not pairs:
+            return
+        if not isinstance(pairs[0], Pair):
+            # Для розрахунку потрібні моделі, навіть якщо результат повертається в іншому форматі
+            pairs = self._make_list(resp, 'pairs', model, RESULT_MODEL)
+        now = time.monotonic()
+        for pair in pairs:
+            self.__pairs[(pair.currency1['code'], pair.currency2['code'])] = (pair, now)
+
+    def _get_local_quote(self, currency1, currency2, amount1, amount2):
+        """
+        Порахувати суми обміну за збереженою валютною парою
+
+        :return: list[amount1, amount2, rate] або None, якщо потрібно запитати api
+        """
+        if self.__local_quotes_max_age is None:
+            return None
+        entry = self.__pairs.get((currency1, currency2))
+        if entry is None:
+            return None
+        pair, stored_at = entry
+        if time.monotonic() - stored_at > self.__local_quotes_max_age:
+            return None
+        return pair.quote(amount1, amount2)
+
+    def _get_lang(self):
         lang = None
         if self.__lang:
             lang = self.__lang
@@ -77,21 +714,45 @@ class HiExConnectorBase:
             _lang = self.__lang_context_var.get()
             if _lang:
                 lang = _lang
+        return lang
+
+    def _pre_request_data(self, data):
         new_data = {}
         for key in data:
             if data[key] is not Empty:
                 new_data[key] = data[key]
-        new_data['lang'] = lang
-        return simplejson.dumps(new_data)
+        new_data['lang'] = self._get_lang()
+        return self.__codec.dumps(new_data)
 
     def get_valid_response(self, body, headers):
+        """
+        Перевірити підпис відповіді (або сповіщення) та розібрати її.
+        Підпис перевіряється по сирих байтах, до розбору JSON
+
+        :param body: Тіло відповіді (bytes або str)
+        :param headers: Заголовки відповіді
+
+        :return: dict
+        """
         self.check_version(headers['X-APP-VERSION'])
         sign = self._get_sign(body, headers['X-APP-TIMESTAMP'])
         resp_sign = headers['X-APP-SIGNATURE']
-        if resp_sign != sign:
+        if not hmac.compare_digest(resp_sign.encode('utf-8'), sign.encode('utf-8')):
             raise ProcessingError(f'No verify hash {resp_sign}!={sign}')
 
-        data = simplejson.loads(body)
+        data = self.__codec.loads(body)
+        self._raise_for_error(data)
+        return data
+
+    @staticmethod
+    def _raise_for_error(data):
+        """
+        Викликати ResponseError, якщо api повернуло помилку
+
+        :param data: Розібрана відповідь api
+
+        :return: None
+        """
         if data['code'] < 0:
             code = data['code']
             param = data['param']
@@ -99,18 +760,16 @@ class HiExConnectorBase:
             if 'detail' in data:
                 detail = data['detail']
             raise ResponseError(detail, code, param)
-        return data
 
     def _get_sign(self, body, timestamp):
         if type(body) == str:
             body = body.encode('utf-8')
         if type(timestamp) == str:
             timestamp = timestamp.encode('utf-8')
-        return hmac.new(
-            self.__private_key.encode('utf-8'),
-            body + timestamp,
-            digestmod=hashlib.sha256
-        ).hexdigest()
+        h = self.__hmac.copy()
+        h.update(body)
+        h.update(timestamp)
+        return h.hexdigest()
 
     @staticmethod
     def get_version_api():
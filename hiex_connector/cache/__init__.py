@@ -0,0 +1,130 @@
+import threading
+import time
+
+
+class CatalogCache:
+    """
+    Кеш каталогів (валюти, валютні пари) з часом життя ttl.
+
+    Після закінчення ttl запис ще stale_ttl секунд віддається як застарілий,
+    поки один фоновий запит його оновлює. Після цього запис вважається відсутнім
+    """
+    FRESH = 'fresh'
+    STALE = 'stale'
+    MISS = 'miss'
+
+    ttl: float
+    stale_ttl: float
+
+    def __init__(self, ttl: float, stale_ttl: float = None):
+        """
+        :param ttl: Скільки секунд запис вважається актуальним
+        :param stale_ttl: Скільки секунд після ttl можна віддавати застарілий запис (None – без обмежень)
+        """
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.__entries = {}
+        self.__refreshing = set()
+        self.__lock = threading.Lock()
+
+    def lookup(self, key):
+        """
+        Знайти запис
+
+        :param key: Ключ запису
+
+        :return: (value, FRESH | STALE | MISS)
+        """
+        entry = self.__entries.get(key)
+        if entry is None:
+            return None, self.MISS
+        value, stored_at = entry
+        age = time.monotonic() - stored_at
+        if age < self.ttl:
+            return value, self.FRESH
+        if self.stale_ttl is None or age < self.ttl + self.stale_ttl:
+            return value, self.STALE
+        return None, self.MISS
+
+    def set(self, key, value):
+        with self.__lock:
+            self.__entries[key] = (value, time.monotonic())
+
+    def start_refresh(self, key):
+        """
+        Позначити, що запис оновлюється
+
+        :param key: Ключ запису
+
+        :return: bool – False, якщо запис вже оновлюється
+        """
+        with self.__lock:
+            if key in self.__refreshing:
+                return False
+            self.__refreshing.add(key)
+            return True
+
+    def finish_refresh(self, key):
+        with self.__lock:
+            self.__refreshing.discard(key)
+
+    def invalidate(self, method=None):
+        """
+        Видалити записи з кешу
+
+        :param method: Метод api (наприклад 'pairs/list'). Якщо не вказано – очистити весь кеш
+
+        :return: None
+        """
+        with self.__lock:
+            if method is None:
+                self.__entries.clear()
+            else:
+                for key in [key for key in self.__entries if key[0] == method]:
+                    del self.__entries[key]
+
+
+class CurrencyRegistry:
+    """
+    Спільні екземпляри Currency за кодом валюти.
+
+    Однакові вкладені валюти в парах, обмінах та платежах замінюються одним об'єктом.
+    Якщо дані валюти в відповіді відрізняються від збережених, створюється та зберігається новий об'єкт
+    """
+    def __init__(self, build):
+        """
+        :param build: Функція, що створює Currency з об'єкта відповіді api
+        """
+        self.__build = build
+        self.__currencies = {}
+
+    def intern(self, data):
+        """
+        Отримати спільний екземпляр валюти
+
+        :param data: Валюта з відповіді api (dict) або вже створена Currency
+
+        :return: Currency (або data, якщо це не dict)
+        """
+        if type(data) is not dict:
+            return data
+        entry = self.__currencies.get(data.get('code'))
+        if entry is not None and entry[1] == data:
+            return entry[0]
+        currency = self.__build(data)
+        self.__currencies[data.get('code')] = (currency, data)
+        return currency
+
+    def update(self, currencies):
+        """
+        Оновити реєстр даними з currencies_list
+
+        :param currencies: list[dict] – валюти з відповіді api
+
+        :return: None
+        """
+        for data in currencies:
+            self.intern(data)
+
+    def __len__(self):
+        return len(self.__currencies)
@@ -0,0 +1,95 @@
+from abc import ABC, abstractmethod
+from decimal import Decimal
+
+import simplejson
+
+from .stream import iter_json_array
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class JsonCodec(ABC):
+    """
+    Серіалізація тіла запитів та відповідей api
+    """
+    @abstractmethod
+    def dumps(self, data) -> str:
+        raise NotImplementedError
+
+    @abstractmethod
+    def loads(self, body):
+        """
+        :param body: str або bytes
+
+        :return: dict
+        """
+        raise NotImplementedError
+
+
+class SimpleJsonCodec(JsonCodec):
+    """
+    Кодек за замовчуванням: дробові числа одразу розбираються в Decimal без проміжного float
+    """
+    def dumps(self, data) -> str:
+        return simplejson.dumps(data)
+
+    def loads(self, body):
+        return simplejson.loads(body, use_decimal=True)
+
+
+class OrjsonCodec(JsonCodec):
+    """
+    Швидкий кодек на основі orjson (pip install orjson).
+
+    orjson розбирає дробові числа як float, тому з decimal=True вони перетворюються в Decimal через repr(float):
+    значення до 15 значущих цифр відновлюються точно. З decimal=False float залишаються у відповіді
+    (найшвидший варіант): поля моделей типу Decimal все одно отримують точне значення, бо pydantic
+    перетворює float через str. Запити серіалізуються через simplejson, бо orjson не вміє записувати Decimal як число
+    """
+    decimal: bool
+
+    def __init__(self, decimal: bool = True):
+        if orjson is None:
+            raise ImportError('OrjsonCodec requires orjson: pip install orjson')
+        self.decimal = decimal
+
+    def dumps(self, data) -> str:
+        return simplejson.dumps(data)
+
+    def loads(self, body):
+        data = orjson.loads(body)
+        if self.decimal:
+            _floats_to_decimal(data)
+        return data
+
+
+def to_decimal(value):
+    """
+    Перетворити число з відповіді api в Decimal без втрати точності
+
+    :param value: Decimal, int, float або str
+
+    :return: Decimal
+    """
+    if type(value) is float:
+        return Decimal(repr(value))
+    return Decimal(value)
+
+
+def _floats_to_decimal(value):
+    if type(value) is dict:
+        for key, item in value.items():
+            if type(item) is float:
+                value[key] = Decimal(repr(item))
+            elif type(item) is dict or type(item) is list:
+                _floats_to_decimal(item)
+    elif type(value) is list:
+        for i, item in enumerate(value):
+            if type(item) is float:
+                value[i] = Decimal(repr(item))
+            elif type(item) is dict or type(item) is list:
+                _floats_to_decimal(item)
+    return value
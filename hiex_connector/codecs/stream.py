@@ -0,0 +1,103 @@
+import codecs
+from decimal import Decimal
+
+import simplejson
+
+_WHITESPACE = ' \t\n\r'
+# Символи, що можуть стояти одразу після значення JSON
+_DELIMITERS = _WHITESPACE + ',:]}'
+
+
+class _JsonReader:
+    """
+    Послідовне читання значень JSON з файлу невеликими блоками
+    """
+    def __init__(self, fp, chunk_size):
+        self.__fp = fp
+        self.__chunk_size = chunk_size
+        self.__decoder = codecs.getincrementaldecoder('utf-8')()
+        self.__json = simplejson.JSONDecoder(parse_float=Decimal)
+        self.__buffer = ''
+        self.__pos = 0
+        self.__eof = False
+
+    def __fill(self):
+        if self.__eof:
+            return False
+        chunk = self.__fp.read(self.__chunk_size)
+        self.__eof = not chunk
+        self.__buffer = self.__buffer[self.__pos:] + self.__decoder.decode(chunk, final=self.__eof)
+        self.__pos = 0
+        return True
+
+    def peek(self):
+        while True:
+            buffer = self.__buffer
+            pos = self.__pos
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            self.__pos = pos
+            if pos < len(buffer):
+                return buffer[pos]
+            if not self.__fill():
+                return ''
+
+    def consume(self, char):
+        if self.peek() == char:
+            self.__pos += 1
+            return True
+        return False
+
+    def expect(self, char):
+        if not self.consume(char):
+            raise simplejson.JSONDecodeError(f'Expecting {char!r}', self.__buffer, self.__pos)
+
+    def decode(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self.__json.raw_decode(self.__buffer, self.__pos)
+            except simplejson.JSONDecodeError:
+                if not self.__fill():
+                    raise
+                continue
+            # Число могло бути обрізане межею блоку (в т.ч. після '.' або 'e') – значення приймається,
+            # лише якщо після нього стоїть роздільник або файл закінчився
+            if (end == len(self.__buffer) or self.__buffer[end] not in _DELIMITERS) and self.__fill():
+                continue
+            self.__pos = end
+            return value
+
+
+def iter_json_array(fp, key, meta, chunk_size=65536):
+    """
+    Розібрати JSON-об'єкт з файлу, повертаючи елементи масиву key по одному.
+    Решта полів верхнього рівня записується в meta. В пам'яті тримається лише поточний елемент
+
+    :param fp: Файл (bytes) з JSON-об'єктом
+    :param key: Ключ масиву (наприклад 'exchanges')
+    :param meta: dict для інших полів верхнього рівня
+    :param chunk_size: Розмір блоку читання
+
+    :return: Iterator[dict]
+    """
+    reader = _JsonReader(fp, chunk_size)
+    reader.expect('{')
+    if reader.consume('}'):
+        return
+    while True:
+        name = reader.decode()
+        reader.expect(':')
+        if name == key and reader.peek() == '[':
+            reader.expect('[')
+            if not reader.consume(']'):
+                while True:
+                    yield reader.decode()
+                    if reader.consume(']'):
+                        break
+                    reader.expect(',')
+        else:
+            meta[name] = reader.decode()
+        if reader.consume('}'):
+            return
+        reader.expect(',')
@@ -36,3 +36,44 @@ class VersionError(Exception):
 
     def __str__(self):
         return f"{self.__class__.__name__}, {self.message}"
+
+
+class ServerError(Exception):
+    message: str = ''
+    status: int = 0
+
+    def __init__(self, message: str = None, status: int = None):
+        if message:
+            self.message = message
+        if status:
+            self.status = status
+
+    def __str__(self):
+        return f"{self.__class__.__name__}, {self.status}, {self.message}"
+
+
+class CircuitOpenError(Exception):
+    message: str = ''
+    method: str = ''
+    retry_after: float = 0
+
+    def __init__(self, method: str = None, retry_after: float = None):
+        if method:
+            self.method = method
+            self.message = f'Circuit for {method} is open'
+        if retry_after:
+            self.retry_after = retry_after
+
+    def __str__(self):
+        return f"{self.__class__.__name__}, {self.method}, retry after {self.retry_after:.1f}s"
+
+
+class DeadlineExceeded(Exception):
+    message: str = ''
+
+    def __init__(self, message: str = None):
+        if message:
+            self.message = message
+
+    def __str__(self):
+        return f"{self.__class__.__name__}, {self.message}"
@@ -0,0 +1,28 @@
+from .rate_limit import (
+    INTERACTIVE,
+    BATCH,
+    rate_limit_lane,
+    use_lane,
+    TokenBucket,
+    RateLimiter,
+)
+from .retry import (
+    CONNECT_ERROR,
+    TRANSIENT_ERROR,
+    READ_METHODS,
+    RetryPolicy,
+)
+from .breaker import (
+    CLOSED,
+    OPEN,
+    HALF_OPEN,
+    CircuitBreaker,
+)
+from .hedge import HedgePolicy
+from .timeout import (
+    deadline_context_var,
+    timeout_context_var,
+    HiExTimeout,
+    deadline,
+    use_timeout,
+)
@@ -0,0 +1,207 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from ..exceptions import CircuitOpenError, DeadlineExceeded
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class _Circuit:
+    def __init__(self):
+        self.state = CLOSED
+        self.calls = deque()
+        self.failures = 0
+        self.slow = 0
+        self.opened_at = 0
+        self.probes = 0
+        self.probe_successes = 0
+
+
+class CircuitBreaker:
+    """
+    Окремий запобіжник для кожного методу api.
+
+    Якщо за останні window секунд було не менше min_requests запитів і частка помилок (або повільних запитів)
+    досягла порогу, запобіжник відкривається: запити до методу одразу завершуються CircuitOpenError.
+    Через open_duration секунд пропускається half_open_probes пробних запитів: якщо всі успішні – запобіжник
+    закривається, якщо хоч один з помилкою – знову відкривається
+    """
+    def __init__(
+            self,
+            failure_rate: float = 0.5,
+            min_requests: int = 20,
+            window: float = 30,
+            open_duration: float = 15,
+            half_open_probes: int = 3,
+            slow_call_duration: float = None,
+            slow_call_rate: float = 0.5,
+    ):
+        """
+        :param failure_rate: Частка помилок, після якої запобіжник відкривається
+        :param min_requests: Мінімальна кількість запитів у вікні для оцінки
+        :param window: Ширина вікна в секундах
+        :param open_duration: Скільки секунд запобіжник відкритий до пробних запитів
+        :param half_open_probes: Скільки пробних запитів потрібно для закриття
+        :param slow_call_duration: Запит довше за стільки секунд вважається повільним (None – не враховувати)
+        :param slow_call_rate: Частка повільних запитів, після якої запобіжник відкривається
+        """
+        self.failure_rate = failure_rate
+        self.min_requests = min_requests
+        self.window = window
+        self.open_duration = open_duration
+        self.half_open_probes = half_open_probes
+        self.slow_call_duration = slow_call_duration
+        self.slow_call_rate = slow_call_rate
+        self.__circuits = {}
+        self.__lock = threading.Lock()
+
+    def check(self, method):
+        """
+        Викликати CircuitOpenError, якщо запобіжник методу відкритий (без резервування пробного запиту)
+
+        :param method: Метод api
+
+        :return: None
+        """
+        with self.__lock:
+            circuit = self.__circuits.get(method)
+            if circuit is not None:
+                self.__check(method, circuit, time.monotonic())
+
+    @contextmanager
+    def guard(self, method):
+        """
+        Виконати запит під захистом запобіжника: помилка або тривалість запиту враховуються в статистиці.
+        Скасування та DeadlineExceeded (вичерпано час викликаючого коду) не вважаються помилкою api
+
+        :param method: Метод api
+        """
+        probe = self.__before(method)
+        started_at = time.monotonic()
+        try:
+            yield
+        except (asyncio.CancelledError, GeneratorExit, KeyboardInterrupt, DeadlineExceeded):
+            self.__release(method, probe)
+            raise
+        except Exception:
+            self.__record(method, probe, time.monotonic() - started_at, True)
+            raise
+        self.__record(method, probe, time.monotonic() - started_at, False)
+
+    def states(self):
+        """
+        Стан запобіжників
+
+        :return: {метод: {'state', 'requests', 'failures', 'slow', 'retry_after'}}
+        """
+        now = time.monotonic()
+        with self.__lock:
+            states = {}
+            for method, circuit in self.__circuits.items():
+                self.__prune(circuit, now)
+                retry_after = 0
+                if circuit.state == OPEN:
+                    retry_after = max(0, circuit.opened_at + self.open_duration - now)
+                states[method] = {
+                    'state': circuit.state,
+                    'requests': len(circuit.calls),
+                    'failures': circuit.failures,
+                    'slow': circuit.slow,
+                    'retry_after': retry_after,
+                }
+            return states
+
+    def reset(self, method=None):
+        """
+        Закрити запобіжник та очистити статистику
+
+        :param method: Метод api (None – всі)
+
+        :return: None
+        """
+        with self.__lock:
+            if method is None:
+                self.__circuits.clear()
+            else:
+                self.__circuits.pop(method, None)
+
+    def __check(self, method, circuit, now):
+        if circuit.state == OPEN:
+            retry_after = circuit.opened_at + self.open_duration - now
+            if retry_after > 0:
+                raise CircuitOpenError(method, retry_after)
+            circuit.state = HALF_OPEN
+            circuit.probes = 0
+            circuit.probe_successes = 0
+        if circuit.state == HALF_OPEN and circuit.probes >= self.half_open_probes:
+            raise CircuitOpenError(method, 0)
+
+    def __before(self, method):
+        with self.__lock:
+            circuit = self.__circuits.get(method)
+            if circuit is None:
+                circuit = self.__circuits[method] = _Circuit()
+            self.__check(method, circuit, time.monotonic())
+            if circuit.state == HALF_OPEN:
+                circuit.probes += 1
+                return True
+            return False
+
+    def __release(self, method, probe):
+        if not probe:
+            return
+        with self.__lock:
+            circuit = self.__circuits.get(method)
+            if circuit is not None and circuit.state == HALF_OPEN:
+                circuit.probes -= 1
+
+    def __record(self, method, probe, duration, failed):
+        slow = self.slow_call_duration is not None and duration > self.slow_call_duration
+        now = time.monotonic()
+        with self.__lock:
+            circuit = self.__circuits.get(method)
+            if circuit is None:
+                return
+            if probe:
+                if circuit.state != HALF_OPEN:
+                    return
+                if failed or slow:
+                    self.__open(circuit, now)
+                    return
+                circuit.probe_successes += 1
+                if circuit.probe_successes >= self.half_open_probes:
+                    circuit.state = CLOSED
+                    circuit.calls.clear()
+                    circuit.failures = circuit.slow = 0
+                return
+            if circuit.state != CLOSED:
+                return
+            circuit.calls.append((now, failed, slow))
+            circuit.failures += failed
+            circuit.slow += slow
+            self.__prune(circuit, now)
+            requests = len(circuit.calls)
+            if requests >= self.min_requests and (
+                    circuit.failures >= self.failure_rate * requests
+                    or (self.slow_call_duration is not None and circuit.slow >= self.slow_call_rate * requests)
+            ):
+                self.__open(circuit, now)
+
+    def __prune(self, circuit, now):
+        calls = circuit.calls
+        while calls and calls[0][0] < now - self.window:
+            _, failed, slow = calls.popleft()
+            circuit.failures -= failed
+            circuit.slow -= slow
+
+    @staticmethod
+    def __open(circuit, now):
+        circuit.state = OPEN
+        circuit.opened_at = now
+        circuit.calls.clear()
+        circuit.failures = circuit.slow = 0
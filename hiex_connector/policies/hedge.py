@@ -0,0 +1,122 @@
+import threading
+from collections import deque
+
+from .retry import READ_METHODS
+
+
+class HedgePolicy:
+    """
+    Дублювання повільних запитів на читання (тільки асинхронний конектор).
+
+    Якщо відповіді немає довше за percentile-й процентиль часу відповіді методу, надсилається такий самий запит
+    іншим з'єднанням з пулу, використовується та відповідь, що прийде першою. Кожен запит поповнює бюджет
+    на budget_ratio, дубль витрачає 1, тож дублів не більше budget_ratio від усіх запитів, навіть під час збою api
+    """
+    def __init__(
+            self,
+            percentile: float = 95,
+            initial_delay: float = 0.5,
+            min_delay: float = 0.02,
+            max_delay: float = 5,
+            min_samples: int = 20,
+            samples: int = 200,
+            budget_ratio: float = 0.1,
+            budget_burst: float = 10,
+            methods=None,
+    ):
+        """
+        :param percentile: Процентиль часу відповіді, після якого надсилається дубль. Має бути нижчим
+            за частку швидких відповідей (100 мінус відсоток повільних), інакше дубль надсилається надто пізно
+        :param initial_delay: Затримка, поки зібрано менше min_samples вимірів
+        :param min_delay: Мінімальна затримка перед дублем
+        :param max_delay: Максимальна затримка перед дублем
+        :param min_samples: Скільки вимірів потрібно, щоб рахувати процентиль
+        :param samples: Скільки останніх вимірів враховувати для кожного методу
+        :param budget_ratio: Частка запитів, які можна дублювати
+        :param budget_burst: Максимальний запас бюджету
+        :param methods: Методи, які можна дублювати (None – READ_METHODS та всі */list)
+        """
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.min_samples = min_samples
+        self.samples = samples
+        self.budget_ratio = budget_ratio
+        self.budget_burst = budget_burst
+        self.__methods = frozenset(methods) if methods is not None else None
+        self.__latencies = {}
+        self.__budget = budget_burst
+        self.__stats = {'requests': 0, 'hedged': 0, 'hedge_wins': 0, 'over_budget': 0}
+        self.__lock = threading.Lock()
+
+    def is_hedged(self, method):
+        if self.__methods is not None:
+            return method in self.__methods
+        return method in READ_METHODS or method.endswith('/list')
+
+    def get_delay(self, method):
+        """
+        Через скільки секунд без відповіді надсилати дубль
+
+        :param method: Метод api
+
+        :return: float
+        """
+        with self.__lock:
+            latencies = self.__latencies.get(method)
+            if latencies is None or len(latencies) < self.min_samples:
+                delay = self.initial_delay
+            else:
+                ordered = sorted(latencies)
+                delay = ordered[min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))]
+        return min(self.max_delay, max(self.min_delay, delay))
+
+    def start(self):
+        """
+        Врахувати новий запит у бюджеті
+
+        :return: None
+        """
+        with self.__lock:
+            self.__stats['requests'] += 1
+            self.__budget = min(self.budget_burst, self.__budget + self.budget_ratio)
+
+    def try_hedge(self):
+        """
+        Зарезервувати дубль з бюджету
+
+        :return: bool – False, якщо бюджет вичерпано
+        """
+        with self.__lock:
+            if self.__budget < 1:
+                self.__stats['over_budget'] += 1
+                return False
+            self.__budget -= 1
+            self.__stats['hedged'] += 1
+            return True
+
+    def record(self, method, latency, hedge_won=False):
+        """
+        Записати час відповіді
+
+        :param method: Метод api
+        :param latency: Скільки секунд чекали на відповідь (якщо виграв дубль – нижня межа часу основного запиту)
+        :param hedge_won: Чи першою прийшла відповідь на дубль
+
+        :return: None
+        """
+        with self.__lock:
+            latencies = self.__latencies.get(method)
+            if latencies is None:
+                latencies = self.__latencies[method] = deque(maxlen=self.samples)
+            latencies.append(latency)
+            if hedge_won:
+                self.__stats['hedge_wins'] += 1
+
+    def stats(self):
+        """
+        :return: {'requests', 'hedged', 'hedge_wins', 'over_budget', 'budget'}
+        """
+        with self.__lock:
+            return {**self.__stats, 'budget': self.__budget}
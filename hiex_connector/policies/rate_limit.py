@@ -0,0 +1,200 @@
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from ..exceptions import DeadlineExceeded
+
+INTERACTIVE = 'interactive'
+BATCH = 'batch'
+
+rate_limit_lane: ContextVar = ContextVar('hiex_rate_limit_lane', default=None)
+
+
+@contextmanager
+def use_lane(lane):
+    """
+    Виконувати запити всередині блоку в указаній черзі пріоритету
+
+    :param lane: INTERACTIVE або BATCH
+    """
+    token = rate_limit_lane.set(lane)
+    try:
+        yield
+    finally:
+        rate_limit_lane.reset(token)
+
+
+class TokenBucket:
+    """
+    Відро токенів: rate токенів за секунду, не більше burst.
+    Кількість токенів може бути від'ємною – це вже зарезервовані запити
+    """
+    rate: float
+    burst: float
+    tokens: float
+    updated_at: float
+
+    def __init__(self, rate: float, burst: float = None):
+        """
+        :param rate: Скільки запитів за секунду
+        :param burst: Скільки запитів можна виконати одразу (за замовчуванням – rate, але не менше 1)
+        """
+        self.rate = rate
+        self.burst = burst if burst is not None else max(rate, 1)
+        self.tokens = self.burst
+        self.updated_at = time.monotonic()
+
+    def refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def time_until_token(self):
+        if self.tokens >= 1:
+            return 0
+        return (1 - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """
+    Обмеження частоти запитів до api на боці клієнта: загальне та для окремих методів.
+
+    Запити з черги INTERACTIVE резервують токен одразу та чекають тільки свою чергу,
+    запити з черги BATCH отримують токен лише коли він вільний, тож пропускають інтерактивні запити вперед.
+    Черга визначається через use_lane(), інакше методи */list – BATCH, решта – INTERACTIVE.
+    Один екземпляр можна використовувати з синхронним та асинхронним конектором
+    """
+    def __init__(
+            self,
+            rate: float = None,
+            burst: float = None,
+            endpoint_limits: dict = None,
+            default_endpoint_limit: tuple = None,
+            batch_methods=None,
+    ):
+        """
+        :param rate: Загальна кількість запитів за секунду (None – без загального обмеження)
+        :param burst: Загальна кількість запитів, які можна виконати одразу
+        :param endpoint_limits: {метод: (rate, burst)} – обмеження окремих методів
+        :param default_endpoint_limit: (rate, burst) для кожного методу без власного обмеження
+        :param batch_methods: Методи, що за замовчуванням виконуються в черзі BATCH (None – всі */list)
+        """
+        self.__global = TokenBucket(rate, burst) if rate is not None else None
+        self.__endpoint_limits = dict(endpoint_limits or {})
+        self.__default_endpoint_limit = default_endpoint_limit
+        self.__batch_methods = set(batch_methods) if batch_methods is not None else None
+        self.__buckets = {}
+        self.__lock = threading.Lock()
+        self.__stats = {}
+
+    def get_lane(self, method):
+        """
+        Черга пріоритету для запиту
+
+        :param method: Метод api
+
+        :return: INTERACTIVE або BATCH
+        """
+        lane = rate_limit_lane.get()
+        if lane is not None:
+            return lane
+        if self.__batch_methods is None:
+            return BATCH if method.endswith('/list') else INTERACTIVE
+        return BATCH if method in self.__batch_methods else INTERACTIVE
+
+    def acquire(self, method, deadline=None):
+        """
+        Дочекатися дозволу на запит (блокує потік)
+
+        :param method: Метод api
+        :param deadline: Дедлайн запиту (time.monotonic()): якщо дозвіл не буде отримано до нього,
+            одразу викликається DeadlineExceeded без резервування токена
+
+        :return: float – скільки секунд довелося чекати
+        """
+        lane = self.get_lane(method)
+        waited = 0
+        while True:
+            wait, acquired = self.__reserve(method, lane, deadline)
+            if wait > 0:
+                time.sleep(wait)
+                waited += wait
+            if acquired:
+                self.__record(lane, waited)
+                return waited
+
+    async def acquire_async(self, method, deadline=None):
+        """
+        Дочекатися дозволу на запит
+
+        :param method: Метод api
+        :param deadline: Дедлайн запиту (time.monotonic()): якщо дозвіл не буде отримано до нього,
+            одразу викликається DeadlineExceeded без резервування токена
+
+        :return: float – скільки секунд довелося чекати
+        """
+        lane = self.get_lane(method)
+        waited = 0
+        while True:
+            wait, acquired = self.__reserve(method, lane, deadline)
+            if wait > 0:
+                await asyncio.sleep(wait)
+                waited += wait
+            if acquired:
+                self.__record(lane, waited)
+                return waited
+
+    def stats(self):
+        """
+        Статистика очікування за чергами
+
+        :return: {lane: {'requests', 'delayed', 'total_wait', 'max_wait'}}
+        """
+        with self.__lock:
+            return {lane: dict(stats) for lane, stats in self.__stats.items()}
+
+    def reset_stats(self):
+        with self.__lock:
+            self.__stats.clear()
+
+    def __reserve(self, method, lane, deadline=None):
+        """
+        :return: (скільки чекати, чи отримано токен)
+        """
+        now = time.monotonic()
+        with self.__lock:
+            buckets = self.__get_buckets(method)
+            for bucket in buckets:
+                bucket.refill(now)
+            wait = max([bucket.time_until_token() for bucket in buckets], default=0)
+            if deadline is not None and now + wait >= deadline:
+                raise DeadlineExceeded(f'{method}: rate limit wait {wait:.3f}s exceeds deadline')
+            if lane == INTERACTIVE or wait <= 0:
+                for bucket in buckets:
+                    bucket.tokens -= 1
+                return wait, True
+            return wait, False
+
+    def __get_buckets(self, method):
+        buckets = self.__buckets.get(method)
+        if buckets is None:
+            buckets = []
+            limit = self.__endpoint_limits.get(method, self.__default_endpoint_limit)
+            if limit is not None:
+                buckets.append(TokenBucket(*limit))
+            if self.__global is not None:
+                buckets.append(self.__global)
+            self.__buckets[method] = buckets
+        return buckets
+
+    def __record(self, lane, waited):
+        with self.__lock:
+            stats = self.__stats.get(lane)
+            if stats is None:
+                stats = self.__stats[lane] = {'requests': 0, 'delayed': 0, 'total_wait': 0.0, 'max_wait': 0.0}
+            stats['requests'] += 1
+            if waited > 0:
+                stats['delayed'] += 1
+                stats['total_wait'] += waited
+                stats['max_wait'] = max(stats['max_wait'], waited)
@@ -0,0 +1,161 @@
+import asyncio
+import random
+import time
+
+import aiohttp
+import requests
+from urllib3.exceptions import ConnectTimeoutError
+
+from ..exceptions import ResponseError, ServerError
+
+# Запит не дійшов до сервера (не вдалося з'єднатися) – повтор безпечний для будь-якого методу
+CONNECT_ERROR = 'connect'
+# Запит міг бути виконаний (обрив після надсилання, таймаут відповіді, 5xx, тимчасова помилка api)
+TRANSIENT_ERROR = 'transient'
+
+READ_METHODS = frozenset([
+    'pair/amount',
+    'exchange/get',
+    'exchange/payment/get',
+    'application/get',
+    'user/get',
+])
+
+
+class RetryPolicy:
+    """
+    Повтор запитів після тимчасових помилок: експоненційна затримка з повним jitter
+    (випадкова від 0 до min(max_delay, base_delay * 2 ** спроба)) та загальний дедлайн.
+
+    Методи на читання (*/list, *_get, pair/amount) повторюються після будь-якої тимчасової помилки,
+    решта (створення, скасування, збереження) – лише якщо з'єднання з сервером не вдалося встановити
+    """
+    attempts: int
+    base_delay: float
+    max_delay: float
+    deadline: float
+    retry_codes: frozenset
+
+    def __init__(
+            self,
+            attempts: int = 3,
+            base_delay: float = 0.1,
+            max_delay: float = 2,
+            deadline: float = 10,
+            retry_codes=(),
+            read_methods=None,
+    ):
+        """
+        :param attempts: Максимальна кількість спроб (1 – без повторів)
+        :param base_delay: Затримка перед першим повтором (верхня межа jitter)
+        :param max_delay: Максимальна затримка між спробами
+        :param deadline: Не починати повтор, якщо з першої спроби мине більше deadline секунд
+        :param retry_codes: Коди ResponseError, що вважаються тимчасовими
+        :param read_methods: Методи, які безпечно повторювати (None – READ_METHODS та всі */list)
+        """
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.retry_codes = frozenset(retry_codes)
+        self.__read_methods = frozenset(read_methods) if read_methods is not None else None
+
+    def is_read_method(self, method):
+        if self.__read_methods is not None:
+            return method in self.__read_methods
+        return method in READ_METHODS or method.endswith('/list')
+
+    def classify(self, exc):
+        """
+        Класифікувати помилку запиту
+
+        :param exc: Виняток
+
+        :return: CONNECT_ERROR, TRANSIENT_ERROR або None (повтор не допоможе)
+        """
+        if isinstance(exc, aiohttp.ClientConnectorError) or isinstance(exc, requests.exceptions.ConnectTimeout):
+            return CONNECT_ERROR
+        # aiohttp не має окремого винятку для тайм-ауту з'єднання: ServerTimeoutError відрізняється лише текстом
+        if isinstance(exc, aiohttp.ServerTimeoutError) and str(exc).startswith('Connection timeout'):
+            return CONNECT_ERROR
+        if isinstance(exc, requests.exceptions.ConnectionError):
+            reason = getattr(exc.args[0], 'reason', None) if exc.args else None
+            if isinstance(reason, ConnectTimeoutError):
+                return CONNECT_ERROR
+            return TRANSIENT_ERROR
+        if isinstance(exc, (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError)):
+            return TRANSIENT_ERROR
+        if isinstance(exc, (requests.exceptions.Timeout, requests.exceptions.ChunkedEncodingError)):
+            return TRANSIENT_ERROR
+        if isinstance(exc, ServerError):
+            return TRANSIENT_ERROR
+        if isinstance(exc, ResponseError) and exc.code in self.retry_codes:
+            return TRANSIENT_ERROR
+        return None
+
+    def get_delay(self, method, exc, attempt, started_at, deadline=None):
+        """
+        Затримка перед наступною спробою
+
+        :param method: Метод api
+        :param exc: Помилка останньої спроби
+        :param attempt: Номер останньої спроби (з 0)
+        :param started_at: time.monotonic() першої спроби
+        :param deadline: Дедлайн запиту (time.monotonic()) або None
+
+        :return: float або None, якщо повторювати не потрібно
+        """
+        if attempt + 1 >= self.attempts:
+            return None
+        kind = self.classify(exc)
+        if kind is None or (kind == TRANSIENT_ERROR and not self.is_read_method(method)):
+            return None
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        now = time.monotonic()
+        if now - started_at + delay > self.deadline or (deadline is not None and now + delay >= deadline):
+            return None
+        return delay
+
+    def call(self, method, func, deadline=None):
+        """
+        Виконати func() з повторами
+
+        :param method: Метод api
+        :param func: Функція, що виконує запит
+        :param deadline: Дедлайн запиту (time.monotonic()) – після нього повтори не починаються
+
+        :return: Результат func()
+        """
+        started_at = time.monotonic()
+        attempt = 0
+        while True:
+            try:
+                return func()
+            except Exception as e:
+                delay = self.get_delay(method, e, attempt, started_at, deadline)
+                if delay is None:
+                    raise
+            time.sleep(delay)
+            attempt += 1
+
+    async def call_async(self, method, func, deadline=None):
+        """
+        Виконати await func() з повторами
+
+        :param method: Метод api
+        :param func: Функція, що повертає корутину запиту
+        :param deadline: Дедлайн запиту (time.monotonic()) – після нього повтори не починаються
+
+        :return: Результат корутини
+        """
+        started_at = time.monotonic()
+        attempt = 0
+        while True:
+            try:
+                return await func()
+            except Exception as e:
+                delay = self.get_delay(method, e, attempt, started_at, deadline)
+                if delay is None:
+                    raise
+            await asyncio.sleep(delay)
+            attempt += 1
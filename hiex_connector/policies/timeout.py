@@ -0,0 +1,97 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from ..exceptions import DeadlineExceeded
+
+# Абсолютний дедлайн (значення time.monotonic()) для всіх запитів у поточному контексті
+deadline_context_var: ContextVar = ContextVar('hiex_deadline', default=None)
+# Тайм-аути для запитів у поточному контексті (мають пріоритет над тайм-аутами конектора)
+timeout_context_var: ContextVar = ContextVar('hiex_timeout', default=None)
+
+
+class HiExTimeout:
+    """
+    Тайм-аути одного запиту до api (в секундах)
+    """
+    total: float
+    connect: float
+    read: float
+    deadline_bound: bool = False
+
+    def __init__(self, total: float = 60, connect: float = 10, read: float = None):
+        """
+        :param total: Максимальний час запиту разом з завантаженням відповіді (None – без обмеження)
+        :param connect: Максимальний час встановлення з'єднання (None – без обмеження)
+        :param read: Максимальна пауза між отриманням даних (за замовчуванням – total)
+        """
+        self.total = total
+        self.connect = _min(connect, total)
+        self.read = _min(read, total)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} total={self.total} connect={self.connect} read={self.read}>"
+
+    def for_deadline(self, deadline):
+        """
+        Тайм-аути, скорочені до часу, що залишився до дедлайну
+
+        :param deadline: Значення time.monotonic() або None
+
+        :return: HiExTimeout
+        """
+        if deadline is None:
+            return self
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise DeadlineExceeded(f'Deadline passed {-remaining:.3f}s ago')
+        if self.total is not None and remaining >= self.total:
+            return self
+        timeout = HiExTimeout(remaining, self.connect, self.read)
+        timeout.deadline_bound = True
+        return timeout
+
+
+def _min(value, limit):
+    """
+    Менше з двох обмежень, None – без обмеження
+    """
+    if value is None:
+        return limit
+    if limit is None:
+        return value
+    return min(value, limit)
+
+
+@contextmanager
+def deadline(seconds, context_var: ContextVar = deadline_context_var):
+    """
+    Обмежити час усіх запитів всередині блоку.
+    Вкладений дедлайн не може бути пізнішим за зовнішній
+
+    :param seconds: Скільки секунд є на всі запити
+    :param context_var: ContextVar з дедлайном (якщо конектору передано власний deadline_context_var)
+    """
+    value = time.monotonic() + seconds
+    current = context_var.get()
+    if current is not None:
+        value = min(value, current)
+    token = context_var.set(value)
+    try:
+        yield value
+    finally:
+        context_var.reset(token)
+
+
+@contextmanager
+def use_timeout(timeout: HiExTimeout):
+    """
+    Використовувати інші тайм-аути для запитів всередині блоку
+
+    :param timeout: HiExTimeout
+    """
+    token = timeout_context_var.set(timeout)
+    try:
+        yield
+    finally:
+        timeout_context_var.reset(token)
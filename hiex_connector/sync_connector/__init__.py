@@ -1,27 +1,46 @@
 from ..base import HiExConnectorBase
-from ..types import Empty, ResponseList
-from decimal import Decimal
+from ..types import Empty
+from ..codecs import to_decimal
 
 
 class HiExConnector(HiExConnectorBase):
     """
     Синхронна бібліотека для роботи з api.hiex.io
+
+    Конектор тримає власний пул з'єднань, який можна використовувати з різних потоків.
+    Закрити його можна через `with HiExConnector(...) as hiex:` або викликом `hiex.close()`
     """
-    def currencies_list(self):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """
+        Закрити пул з'єднань. Під час наступного запиту буде створено новий
+
+        :return: None
+        """
+        self._close_session()
+
+    def currencies_list(self, result_mode=None):
         """
         Отримати список валют
 
+        :param result_mode: 'model', 'dict' або 'record' (за замовчуванням – налаштування конектора)
+
         :return: ResponseList[Currency]
         """
-        resp = self.get_request('currencies/list', {})
         from ..types.sync_types import SyncCurrency
-        currencies = ResponseList()
-        currencies.is_all = resp['is_all']
-        for currency in resp['currencies']:
-            currencies.append(SyncCurrency(connector=self, **currency))
-        return currencies
 
-    def pairs_list(self, currency1=Empty, currency2=Empty, search1=Empty, search2=Empty):
+        def build(resp):
+            self._remember_currencies(resp['currencies'])
+            return self._make_list(resp, 'currencies', SyncCurrency, result_mode)
+
+        return self.get_catalog('currencies/list', {}, build, result_mode)
+
+    def pairs_list(self, currency1=Empty, currency2=Empty, search1=Empty, search2=Empty, result_mode=None):
         """
         Отримати список валютних пар
 
@@ -29,21 +48,23 @@ class HiExConnector(HiExConnectorBase):
         :param currency2: Валюта яку продаємо
         :param search1: Пошук валют які купуємо
         :param search2: Пошук валют які продаємо
+        :param result_mode: 'model', 'dict' або 'record' (за замовчуванням – налаштування конектора)
 
         :return: ResponseList[Pair]
         """
-        resp = self.get_request('pairs/list', {
+        from ..types.sync_types import SyncPair
+
+        def build(resp):
+            pairs = self._make_list(resp, 'pairs', SyncPair, result_mode)
+            self._remember_pairs(resp, pairs, SyncPair)
+            return pairs
+
+        return self.get_catalog('pairs/list', {
             'currency1': currency1,
             'currency2': currency2,
             'search1': search1,
             'search2': search2,
-        })
-        from ..types.sync_types import SyncPair
-        pairs = ResponseList()
-        pairs.is_all = resp['is_all']
-        for pair in resp['pairs']:
-            pairs.append(SyncPair(connector=self, **pair))
-        return pairs
+        }, build, result_mode)
 
     def pair_amount(self, currency1, currency2, amount1=Empty, amount2=Empty):
         """
@@ -56,13 +77,16 @@ class HiExConnector(HiExConnectorBase):
 
         :return: list[amount1, amount2, rate]
         """
+        quote = self._get_local_quote(currency1, currency2, amount1, amount2)
+        if quote is not None:
+            return quote
         resp = self.get_request('pair/amount', {
             'currency1': currency1,
             'currency2': currency2,
             'amount1': amount1,
             'amount2': amount2,
         })
-        return Decimal(resp['amount1']), Decimal(resp['amount2']), Decimal(resp['rate'])
+        return to_decimal(resp['amount1']), to_decimal(resp['amount2']), to_decimal(resp['rate'])
 
     def exchange_create(
             self, currency1, currency2, address, tag=Empty, amount1=Empty, amount2=Empty, return_url=Empty,
@@ -102,7 +126,7 @@ class HiExConnector(HiExConnectorBase):
             'beneficiary_phone': beneficiary_phone,
             'validation': validation,
         })
-        return SyncExchange(connector=self, **resp['exchange']) if resp['exchange'] else None
+        return self._make(SyncExchange, resp['exchange']) if resp['exchange'] else None
 
     def exchange_payment_get(self, exchange_id):
         """
@@ -116,7 +140,7 @@ class HiExConnector(HiExConnectorBase):
         resp = self.get_request('exchange/payment/get', {
             'exchange_id': exchange_id,
         })
-        return SyncPayment(connector=self, **resp['payment'])
+        return self._make(SyncPayment, resp['payment'])
 
     def exchange_get(self, exchange_id, auth_key=None):
         """
@@ -131,10 +155,10 @@ class HiExConnector(HiExConnectorBase):
         })
         if auth_key is None:
             from ..types.sync_types import SyncExchange
-            return SyncExchange(connector=self, **resp['exchange'])
+            return self._make(SyncExchange, resp['exchange'])
         else:
             from ..types.sync_types import SyncExchangeWithAuthKey
-            return SyncExchangeWithAuthKey(connector=self, auth_key=auth_key, **resp['exchange'])
+            return self._make(SyncExchangeWithAuthKey, resp['exchange'], auth_key=auth_key)
 
     def exchange_cancel(self, exchange_id):
         """
@@ -149,7 +173,7 @@ class HiExConnector(HiExConnectorBase):
         })
         return True
 
-    def exchanges_list(self, limit=Empty, offset=Empty, status_list=Empty, short_exchange_id=Empty):
+    def exchanges_list(self, limit=Empty, offset=Empty, status_list=Empty, short_exchange_id=Empty, result_mode=None):
         """
         Отримати список обмінів
 
@@ -157,6 +181,7 @@ class HiExConnector(HiExConnectorBase):
         :param offset: Починати з рядку
         :param status_list: Список статусів
         :param short_exchange_id: Перші символи з exchange_id
+        :param result_mode: 'model', 'dict' або 'record' (за замовчуванням – налаштування конектора)
 
 
         :return: ResponseList[Exchange]
@@ -168,13 +193,11 @@ class HiExConnector(HiExConnectorBase):
             'status_list': status_list,
             'short_exchange_id': short_exchange_id,
         })
-        exchanges = ResponseList()
-        exchanges.is_all = resp['is_all']
-        for exchange in resp['exchanges']:
-            exchanges.append(SyncExchange(connector=self, **exchange))
-        return exchanges
+        return self._make_list(resp, 'exchanges', SyncExchange, result_mode)
 
-    def application_exchanges_list(self, limit=Empty, offset=Empty, user_id=Empty, status_list=Empty, short_exchange_id=Empty):
+    def application_exchanges_list(
+            self, limit=Empty, offset=Empty, user_id=Empty, status_list=Empty, short_exchange_id=Empty, result_mode=None,
+    ):
         """
         Отримати список обмінів
 
@@ -183,6 +206,7 @@ class HiExConnector(HiExConnectorBase):
         :param user_id: ID користувача
         :param status_list: Список статусів
         :param short_exchange_id: Перші символи з exchange_id
+        :param result_mode: 'model', 'dict' або 'record' (за замовчуванням – налаштування конектора)
 
 
         :return: ResponseList[Exchange]
@@ -195,18 +219,15 @@ class HiExConnector(HiExConnectorBase):
             'status_list': status_list,
             'short_exchange_id': short_exchange_id,
         })
-        exchanges = ResponseList()
-        exchanges.is_all = resp['is_all']
-        for exchange in resp['exchanges']:
-            exchanges.append(SyncExchange(connector=self, **exchange))
-        return exchanges
+        return self._make_list(resp, 'exchanges', SyncExchange, result_mode)
 
-    def application_users_list(self, limit=Empty, offset=Empty):
+    def application_users_list(self, limit=Empty, offset=Empty, result_mode=None):
         """
         Отримати список користувачів
 
         :param limit: Скільки обмінів завантажувати
         :param offset: Починати з рядку
+        :param result_mode: 'model', 'dict' або 'record' (за замовчуванням – налаштування конектора)
 
 
         :return: ResponseList[User]
@@ -216,18 +237,15 @@ class HiExConnector(HiExConnectorBase):
             'limit': limit,
             'offset': offset,
         })
-        users = ResponseList()
-        users.is_all = resp['is_all']
-        for user in resp['users']:
-            users.append(SyncUser(connector=self, **user))
-        return users
+        return self._make_list(resp, 'users', SyncUser, result_mode)
 
-    def application_stats_list(self, limit=Empty, offset=Empty):
+    def application_stats_list(self, limit=Empty, offset=Empty, result_mode=None):
         """
         Завантажити статистику (за вибіркою)
 
         :param limit: Кількість днів
         :param offset: Скільки останніх днів пропустити
+        :param result_mode: 'model', 'dict' або 'record' (за замовчуванням – налаштування конектора)
 
         :return: ResponseList[Stat]
         """
@@ -236,11 +254,7 @@ class HiExConnector(HiExConnectorBase):
             'limit': limit,
             'offset': offset,
         })
-        stats = ResponseList()
-        stats.is_all = resp['is_all']
-        for stat in resp['stats']:
-            stats.append(SyncStat(connector=self, **stat))
-        return stats
+        return self._make_list(resp, 'stats', SyncStat, result_mode)
 
     def application_get(self):
         """
@@ -250,7 +264,7 @@ class HiExConnector(HiExConnectorBase):
         """
         from ..types.sync_types import SyncApplication
         resp = self.get_request('application/get', {})
-        return SyncApplication(connector=self, **resp['application'])
+        return self._make(SyncApplication, resp['application'])
 
     def application_interest_set(self, interest):
         """
@@ -263,7 +277,7 @@ class HiExConnector(HiExConnectorBase):
         resp = self.get_request('application/interest/set', {
             'interest': interest,
         })
-        return Decimal(resp['interest'])
+        return to_decimal(resp['interest'])
 
     def user_get(self, auth_key):
         """
@@ -277,15 +291,16 @@ class HiExConnector(HiExConnectorBase):
         resp = self.get_request('user/get', {
             'auth_key': auth_key,
         })
-        return SyncUserWithAuthKey(connector=self, auth_key=auth_key, **resp['user'])
+        return self._make(SyncUserWithAuthKey, resp['user'], auth_key=auth_key)
 
-    def user_referrals_list(self, auth_key, limit=Empty, offset=Empty):
+    def user_referrals_list(self, auth_key, limit=Empty, offset=Empty, result_mode=None):
         """
         Завантажити список рефералів
 
         :param auth_key: Ключ користувача
         :param limit: Скільки рефералів завантажувати
         :param offset: Починати з рядку
+        :param result_mode: 'model', 'dict' або 'record' (за замовчуванням – налаштування конектора)
 
         :return: list
         """
@@ -295,11 +310,7 @@ class HiExConnector(HiExConnectorBase):
             'limit': limit,
             'offset': offset,
         })
-        referrals = ResponseList()
-        referrals.is_all = resp['is_all']
-        for referral in resp['referrals']:
-            referrals.append(SyncReferral(connector=self, **referral))
-        return referrals
+        return self._make_list(resp, 'referrals', SyncReferral, result_mode)
 
     def user_logout(self, auth_key):
         """
@@ -332,13 +343,14 @@ class HiExConnector(HiExConnectorBase):
             'option': option,
             'return_url': return_url,
         })
-        return SyncVerification(connector=self, **resp['verification'])
+        return self._make(SyncVerification, resp['verification'])
 
-    def user_kyc_methods_list(self, auth_key):
+    def user_kyc_methods_list(self, auth_key, result_mode=None):
         """
         Завантажити можливі способи проходження верифікації
 
         :param auth_key: Ключ користувача
+        :param result_mode: 'model', 'dict' або 'record' (за замовчуванням – налаштування конектора)
 
         :return: ResponseList[VerificationService]
         """
@@ -346,11 +358,7 @@ class HiExConnector(HiExConnectorBase):
         resp = self.get_request('user/kyc/methods/list', {
             'auth_key': auth_key,
         })
-        verification_services = ResponseList()
-        verification_services.is_all = resp['is_all']
-        for method in resp['methods']:
-            verification_services.append(SyncVerificationService(connector=self, **method))
-        return verification_services
+        return self._make_list(resp, 'methods', SyncVerificationService, result_mode)
 
     def user_auth(self, email, referral_token=Empty):
         """
@@ -366,7 +374,7 @@ class HiExConnector(HiExConnectorBase):
             'email': email,
             'referral_token': referral_token,
         })
-        return SyncAuth(connector=self, **resp['auth'])
+        return self._make(SyncAuth, resp['auth'])
 
     def user_auth_code(self, auth_key, code):
         """
@@ -382,7 +390,7 @@ class HiExConnector(HiExConnectorBase):
             'auth_key': auth_key,
             'code': code,
         })
-        return SyncAuth(connector=self, **resp['auth'])
+        return self._make(SyncAuth, resp['auth'])
 
     def user_exchange_create(
             self, auth_key, currency1, currency2, address, tag=Empty, amount1=Empty, amount2=Empty, return_url=Empty,
@@ -424,9 +432,11 @@ class HiExConnector(HiExConnectorBase):
             'beneficiary_phone': beneficiary_phone,
             'validation': validation,
         })
-        return SyncExchangeWithAuthKey(connector=self, auth_key=auth_key, **resp['exchange']) if resp['exchange'] else None
+        return self._make(SyncExchangeWithAuthKey, resp['exchange'], auth_key=auth_key) if resp['exchange'] else None
 
-    def user_exchanges_list(self, auth_key, limit=Empty, offset=Empty, status_list=Empty, short_exchange_id=Empty):
+    def user_exchanges_list(
+            self, auth_key, limit=Empty, offset=Empty, status_list=Empty, short_exchange_id=Empty, result_mode=None,
+    ):
         """
         Отримати список обмінів користувача (за вибіркою)
 
@@ -435,6 +445,7 @@ class HiExConnector(HiExConnectorBase):
         :param offset: Починати з рядку
         :param status_list: Список статусів
         :param short_exchange_id: Перші символи з exchange_id
+        :param result_mode: 'model', 'dict' або 'record' (за замовчуванням – налаштування конектора)
 
 
         :return: ResponseList[Exchange]
@@ -447,11 +458,7 @@ class HiExConnector(HiExConnectorBase):
             'status_list': status_list,
             'short_exchange_id': short_exchange_id,
         })
-        exchanges = ResponseList()
-        exchanges.is_all = resp['is_all']
-        for exchange in resp['exchanges']:
-            exchanges.append(SyncExchangeWithAuthKey(connector=self, auth_key=auth_key, **exchange))
-        return exchanges
+        return self._make_list(resp, 'exchanges', SyncExchangeWithAuthKey, result_mode, auth_key=auth_key)
 
     def user_data_save(self, auth_key, **kwargs):
         """
@@ -14,4 +14,12 @@ from .base import (
     Referral,
     VerificationService,
     Verification,
+    get_currency_fields,
+)
+from .records import (
+    RESULT_MODEL,
+    RESULT_DICT,
+    RESULT_RECORD,
+    BaseRecord,
+    get_record_type,
 )
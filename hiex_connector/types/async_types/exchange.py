@@ -12,6 +12,21 @@ class AsyncExchange(AsyncBase, Exchange):
         super().__init__(**o.get_dict())
         return True
 
+    def refresh_from(self, exchange):
+        """
+        Оновити інформацію обміну даними з іншого екземпляру цього ж обміну
+
+        :param exchange: Exchange
+
+        :return: bool – чи змінилась інформація
+        """
+        data = exchange.get_dict()
+        data.pop('connector', None)
+        if all(self[key] == value for key, value in data.items()):
+            return False
+        super().__init__(**{**self.get_dict(), **data})
+        return True
+
     async def payment(self):
         """
         Отримати реквізити для сплати обміну
@@ -1,11 +1,18 @@
-from decimal import Decimal
+from decimal import Decimal, ROUND_DOWN
 from typing import Optional, Union
 from pydantic import BaseModel
 
+from ..codecs import to_decimal
+
 
 class ResponseList(list):
     is_all: bool = False
 
+    def copy(self):
+        new = ResponseList(self)
+        new.is_all = self.is_all
+        return new
+
 
 class Empty:
     def __init__(self):
@@ -16,6 +23,29 @@ class BaseType(BaseModel):
     class Config:
         arbitrary_types_allowed = True
 
+    @classmethod
+    def construct_trusted(cls, **data):
+        """
+        Створити модель з даних, яким можна довіряти (відповідь api з перевіреним підписом), без валідації pydantic.
+        Вкладені Currency/AdditionalFields та поля Decimal все одно перетворюються, зайві ключі відкидаються
+
+        :param data: Поля моделі
+
+        :return: Екземпляр моделі
+        """
+        values = {}
+        for key, default, convert in _get_trusted_fields(cls):
+            value = data.get(key, default)
+            if convert is not None and value is not None:
+                value = convert(value)
+            values[key] = value
+        model = cls.__new__(cls)
+        object.__setattr__(model, '__dict__', values)
+        object.__setattr__(model, '__fields_set__', data.keys() & values.keys())
+        if cls.__private_attributes__:
+            model._init_private_attributes()
+        return model
+
     def __repr__(self):
         return (
             f"<{self.__class__.__name__} values: "
@@ -31,11 +61,77 @@ class BaseType(BaseModel):
         return {key: self[key] for key in keys}
 
 
+_trusted_fields = {}
+
+
+def _get_trusted_fields(model):
+    """
+    Поля моделі для construct_trusted: (назва, значення за замовчуванням, перетворення або None).
+    Обчислюються один раз для кожної моделі
+    """
+    fields = _trusted_fields.get(model)
+    if fields is None:
+        fields = []
+        for key, field in model.__fields__.items():
+            types = [sub_field.type_ for sub_field in field.sub_fields] if field.sub_fields else [field.type_]
+            convert = None
+            for type_ in types:
+                if isinstance(type_, type) and issubclass(type_, BaseType):
+                    convert = _nested_converter(type_)
+                    break
+                if type_ is Decimal:
+                    convert = _convert_decimal
+                    break
+            fields.append((key, field.get_default(), convert))
+        _trusted_fields[model] = fields
+    return fields
+
+
+_currency_fields = {}
+
+
+def get_currency_fields(model):
+    """
+    Поля моделі з вкладеною валютою (Currency)
+
+    :param model: Нащадок BaseType
+
+    :return: tuple[str]
+    """
+    fields = _currency_fields.get(model)
+    if fields is None:
+        fields = []
+        for key, field in model.__fields__.items():
+            types = [sub_field.type_ for sub_field in field.sub_fields] if field.sub_fields else [field.type_]
+            if any(isinstance(type_, type) and issubclass(type_, Currency) for type_ in types):
+                fields.append(key)
+        fields = tuple(fields)
+        _currency_fields[model] = fields
+    return fields
+
+
+def _nested_converter(model):
+    def convert(value):
+        if type(value) is dict:
+            return model.construct_trusted(**value)
+        return value
+    return convert
+
+
+def _convert_decimal(value):
+    if type(value) is Decimal:
+        return value
+    return to_decimal(value)
+
+
 class BaseWithAuthKey(BaseType):
     auth_key: str
 
 
 class Currency(BaseType):
+    class Config:
+        copy_on_model_validation = 'none'
+
     code: str
     short_name: str
     name: str
@@ -108,6 +204,35 @@ class Pair(BaseType):
         if not isinstance(self.currency2, Currency):
             self.currency2 = Currency(**self.currency2)
 
+    def quote(self, amount1=Empty, amount2=Empty):
+        """
+        Порахувати суми обміну локально, без запиту до api.
+        Курс – price * price_factor, суми округлюються вниз до round_ndigits валюти
+
+        :param amount1: Сума в currency1
+        :param amount2: Сума в currency2
+
+        :return: list[amount1, amount2, rate] або None, якщо сума виходить за межі пари
+        """
+        rate = self.price * self.price_factor
+        if not rate:
+            return None
+        ndigits1 = Decimal(1).scaleb(-self.currency1['round_ndigits'])
+        ndigits2 = Decimal(1).scaleb(-self.currency2['round_ndigits'])
+        if amount1 is not Empty and amount1 is not None:
+            amount1 = Decimal(str(amount1)).quantize(ndigits1, ROUND_DOWN)
+            amount2 = (amount1 * rate).quantize(ndigits2, ROUND_DOWN)
+        elif amount2 is not Empty and amount2 is not None:
+            amount2 = Decimal(str(amount2)).quantize(ndigits2, ROUND_DOWN)
+            amount1 = (amount2 / rate).quantize(ndigits1, ROUND_DOWN)
+        else:
+            return None
+        if not self.min_amount1 <= amount1 <= self.max_amount1:
+            return None
+        if not self.min_amount2 <= amount2 <= self.max_amount2:
+            return None
+        return amount1, amount2, rate
+
 
 class Stat(BaseType):
     day: str
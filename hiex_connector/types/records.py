@@ -0,0 +1,45 @@
+RESULT_MODEL = 'model'
+RESULT_DICT = 'dict'
+RESULT_RECORD = 'record'
+
+_record_types = {}
+
+
+class BaseRecord:
+    """
+    Легкий запис без валідації, з тими ж полями, що й відповідна модель BaseType
+    """
+    __slots__ = ()
+
+    def __init__(self, **data):
+        for key in self.__slots__:
+            setattr(self, key, data.get(key))
+
+    def __repr__(self):
+        return (
+            f"<{self.__class__.__name__} values: "
+            + ";".join([f"{key}={self[key]}" for key in self.__slots__])
+            + ">"
+        )
+
+    def __getitem__(self, item):
+        return getattr(self, item)
+
+    def get_dict(self):
+        return {key: self[key] for key in self.__slots__}
+
+
+def get_record_type(model):
+    """
+    Клас запису для моделі (створюється один раз для кожної моделі)
+
+    :param model: Нащадок BaseType
+
+    :return: type[BaseRecord]
+    """
+    record_type = _record_types.get(model)
+    if record_type is None:
+        fields = tuple(key for key in model.__fields__ if key != 'connector')
+        record_type = type(f'{model.__name__}Record', (BaseRecord,), {'__slots__': fields})
+        _record_types[model] = record_type
+    return record_type
@@ -0,0 +1,79 @@
+import random
+import timeit
+from decimal import Decimal
+
+import simplejson
+from hiex_connector import SimpleJsonCodec, OrjsonCodec
+
+ITEMS = 500
+REPEAT = 200
+
+
+def currency(code, round_ndigits):
+    return {
+        'code': code,
+        'short_name': code.split('_')[0],
+        'name': code.replace('_', ' '),
+        'available_tag': False,
+        'round_ndigits': round_ndigits,
+        'img': f'https://hiex.io/img/{code.lower()}.svg',
+    }
+
+
+def exchanges_list_body(items):
+    """
+    Відповідь exchanges_list з items обмінами, схожа на реальну
+    """
+    random.seed(1)
+    exchanges = []
+    for i in range(items):
+        amount1 = Decimal(random.randint(1000, 10 ** 7)) / 100
+        exchanges.append({
+            'exchange_id': f'{random.getrandbits(128):032x}',
+            'user_id': random.randint(1, 10 ** 6),
+            'status': random.randint(1, 9),
+            'amount1': amount1,
+            'amount2': (amount1 * Decimal('41.0734')).quantize(Decimal('0.01')),
+            'currency1': currency('USDT_TRC20', 2),
+            'currency2': currency('UAH_VISAMASTER', 2),
+            'address': '4149' + ''.join(random.choice('0123456789') for _ in range(12)),
+            'tag': None,
+            'additional_fields': {
+                'beneficiary_email': None,
+                'beneficiary_first_name': 'Іван',
+                'beneficiary_last_name': 'Петренко',
+                'beneficiary_tin': None,
+                'beneficiary_phone': '+380501234567',
+            },
+            'created_at': 1690000000 + i,
+            'closed_at': None,
+        })
+    return simplejson.dumps({'code': 0, 'is_all': False, 'exchanges': exchanges})
+
+
+def main():
+    body = exchanges_list_body(ITEMS)
+    print(f'exchanges_list: {ITEMS} обмінів, {len(body)} байт, {REPEAT} повторів')
+
+    reference = SimpleJsonCodec().loads(body)
+    candidates = [
+        ('simplejson (float)', lambda: simplejson.loads(body)),
+        ('SimpleJsonCodec', lambda: SimpleJsonCodec().loads(body)),
+    ]
+    try:
+        orjson_codec = OrjsonCodec()
+        orjson_float_codec = OrjsonCodec(decimal=False)
+    except ImportError:
+        print('orjson не встановлено, OrjsonCodec пропущено')
+    else:
+        assert orjson_codec.loads(body) == reference, 'OrjsonCodec повертає інші значення'
+        candidates.append(('OrjsonCodec', lambda: orjson_codec.loads(body)))
+        candidates.append(('OrjsonCodec (float)', lambda: orjson_float_codec.loads(body)))
+
+    for name, func in candidates:
+        seconds = min(timeit.repeat(func, number=REPEAT, repeat=3)) / REPEAT
+        print('{:<20} {:>8.3f} мс'.format(name, seconds * 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import hashlib
+import hmac
+import time
+import timeit
+
+from hiex_connector import HiExConnector
+from bench_codecs import exchanges_list_body
+
+PRIVATE_KEY = 'x' * 64
+REPEAT = 20000
+
+
+def old_sign(body: str, timestamp: str):
+    """
+    Підпис до переходу на байти: текст кодується на кожен виклик, HMAC створюється з нуля
+    """
+    return hmac.new(
+        PRIVATE_KEY.encode('utf-8'),
+        body.encode('utf-8') + timestamp.encode('utf-8'),
+        digestmod=hashlib.sha256
+    ).hexdigest()
+
+
+def main():
+    hiex = HiExConnector(PRIVATE_KEY, 'public')
+    timestamp = str(time.time())
+    bodies = [
+        ('запит pair_amount', '{"currency1": "USDT_TRC20", "currency2": "UAH_VISAMASTER", "amount1": 100, "lang": null}'),
+        ('exchanges_list x20', exchanges_list_body(20)),
+    ]
+    for name, body in bodies:
+        raw = body.encode('utf-8')
+        sign = old_sign(body, timestamp)
+        assert hiex._get_sign(raw, timestamp) == sign
+        candidates = [
+            ('str + hmac.new', lambda: old_sign(body, timestamp) == sign),
+            ('bytes + copy', lambda: hmac.compare_digest(hiex._get_sign(raw, timestamp), sign)),
+        ]
+        print(f'{name}: {len(raw)} байт')
+        for candidate, func in candidates:
+            seconds = min(timeit.repeat(func, number=REPEAT, repeat=3)) / REPEAT
+            print('    {:<16} {:>8.2f} мкс'.format(candidate, seconds * 10 ** 6))
+
+
+if __name__ == "__main__":
+    main()
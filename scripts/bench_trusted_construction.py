@@ -0,0 +1,36 @@
+import timeit
+
+from hiex_connector import HiExConnector, SimpleJsonCodec
+from hiex_connector.types.sync_types import SyncExchange
+from bench_codecs import exchanges_list_body
+
+SIZES = (1000, 5000, 10000)
+REPEAT = 3
+
+
+def fields(exchange):
+    data = exchange.get_dict()
+    data.pop('connector')
+    return data
+
+
+def main():
+    hiex = HiExConnector('private', 'public')
+    trusted = HiExConnector('private', 'public', trusted_construction=True)
+    for size in SIZES:
+        resp = SimpleJsonCodec().loads(exchanges_list_body(size))
+        validated = hiex._make_list(resp, 'exchanges', SyncExchange)
+        constructed = trusted._make_list(resp, 'exchanges', SyncExchange)
+        assert [fields(e) for e in validated] == [fields(e) for e in constructed]
+        candidates = [
+            ('валідація pydantic', lambda: hiex._make_list(resp, 'exchanges', SyncExchange)),
+            ('construct_trusted', lambda: trusted._make_list(resp, 'exchanges', SyncExchange)),
+        ]
+        print(f'exchanges_list: {size} обмінів')
+        for name, func in candidates:
+            seconds = min(timeit.repeat(func, number=1, repeat=REPEAT))
+            print('    {:<20} {:>8.1f} мс'.format(name, seconds * 1000))
+
+
+if __name__ == "__main__":
+    main()
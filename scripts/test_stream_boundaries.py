@@ -0,0 +1,39 @@
+import io
+from decimal import Decimal
+
+import simplejson
+from hiex_connector.codecs import iter_json_array
+
+NUMBERS = ('1234.5678e2', '-0.000012345', '98765432101234567890', '1E-7', '0')
+
+
+def body_with_number(prefix_size, number):
+    """
+    Відповідь, в якій число (поле верхнього рівня) починається з позиції prefix_size,
+    а масив містить те саме число окремими елементами
+    """
+    head = '{"pad": "'
+    tail = '", "amount": '
+    pad = 'x' * max(0, prefix_size - len(head) - len(tail))
+    return f'{head}{pad}{tail}{number}, "amounts": [{number}, {number}], "count": 2}}'.encode()
+
+
+def main():
+    chunk_size = 64
+    checked = 0
+    for number in NUMBERS:
+        expected = simplejson.loads(number, use_decimal=True)
+        # Межа блоку проходить через кожен символ числа
+        for shift in range(-2, len(number) + 2):
+            body = body_with_number(chunk_size * 3 - shift, number)
+            meta = {}
+            items = list(iter_json_array(io.BytesIO(body), 'amounts', meta, chunk_size))
+            assert items == [expected, expected], (number, shift, items)
+            assert meta['amount'] == expected and meta['count'] == 2, (number, shift, meta)
+            assert isinstance(meta['amount'], (int, Decimal))
+            checked += 1
+    print(f'OK: {checked} меж блоків')
+
+
+if __name__ == "__main__":
+    main()